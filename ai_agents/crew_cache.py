@@ -0,0 +1,50 @@
+import inspect
+from crewai.utilities.events.event_listener import event_listener
+
+# CrewBase class -> memoize caches of its @agent, @task and @crew methods
+_class_caches = {}
+
+
+def _memoize_caches(crew_class):
+    """The dicts crewAI's memoize decorator keeps in the closures of a CrewBase class's methods"""
+    if crew_class not in _class_caches:
+        caches = []
+        for _, member in inspect.getmembers(crew_class, inspect.isfunction):
+            for cell in member.__closure__ or ():
+                try:
+                    contents = cell.cell_contents
+                except ValueError:
+                    continue
+                if isinstance(contents, dict):
+                    caches.append(contents)
+        _class_caches[crew_class] = caches
+    return _class_caches[crew_class]
+
+
+def release_crew(crew_base):
+    """
+    Drop what crewAI keeps of a CrewBase instance once its crew has run.
+
+    crewAI memoizes the agents, tasks and crew in class-level caches keyed by the
+    instance, and its event listener keeps every finished task as a key of its span
+    map. Neither is ever evicted, so every crew built by a long-running worker would
+    stay alive with its agents, LLM clients and prompts.
+    """
+    for task in getattr(crew_base, "tasks", None) or ():
+        # Only finished tasks, a running one still needs its telemetry span
+        if event_listener.execution_spans.get(task, False) is None:
+            event_listener.execution_spans.pop(task, None)
+
+    for cache in _memoize_caches(type(crew_base)):
+        for key in list(cache):
+            args = key[0] if isinstance(key, tuple) and key else None
+            if isinstance(args, tuple) and args and args[0] is crew_base:
+                cache.pop(key, None)
+
+
+def kickoff_crew(crew_base, inputs=None):
+    """Build and kick off the crew of a CrewBase instance, then release what crewAI cached for it"""
+    try:
+        return crew_base.crew().kickoff(inputs=inputs)
+    finally:
+        release_crew(crew_base)
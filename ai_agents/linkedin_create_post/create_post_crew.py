@@ -1,6 +1,7 @@
 from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, crew, task
 from config.llm_config import llm
+from helpers.tracing import trace_step, trace_task
 
 @CrewBase
 class LinkedInPostCreator:
@@ -9,16 +10,17 @@ class LinkedInPostCreator:
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    def __init__(self):
+    def __init__(self, agent_llm=None):
         super().__init__()
         self.topic = None
         self.input_data = {}
+        self.agent_llm = agent_llm or llm
 
     @agent
     def linkedin_post_creator(self) -> Agent:
         return Agent(
             config=self.agents_config['linkedin_post_creator'],
-            llm=llm,
+            llm=self.agent_llm,
             verbose=False  # Reduced verbosity for speed
         )
 
@@ -35,6 +37,8 @@ class LinkedInPostCreator:
             tasks=[self.create_linkedin_post_task()],
             process=Process.sequential,
             verbose=False,
+            step_callback=trace_step,
+            task_callback=trace_task,
         )
 
 def run_crew():
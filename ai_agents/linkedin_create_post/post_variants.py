@@ -0,0 +1,120 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+import litellm
+from crewai import LLM
+from ai_agents.linkedin_create_post.create_post_crew import LinkedInPostCreator
+from ai_agents.crew_cache import kickoff_crew
+from config.llm_config import llm
+from helpers.tracing import trace_span, record_token_usage
+
+POST_VARIANT_WORKERS = int(os.getenv("POST_VARIANT_WORKERS", "4"))
+# Sampled a bit hotter than a single post so the variants actually differ
+VARIANT_TEMPERATURE = 0.9
+
+
+def supports_batched_variants(agent_llm):
+    """True if the provider can return several completions for one request (the `n` parameter)"""
+    if not isinstance(agent_llm, LLM) or agent_llm.stream:
+        return False
+    try:
+        return "n" in (litellm.get_supported_openai_params(model=agent_llm.model) or [])
+    except Exception:
+        return False
+
+
+def _post_messages(topic):
+    """The post creator crew's agent and task prompts, rendered for one topic"""
+    crew = LinkedInPostCreator()
+    agent = crew.agents_config["linkedin_post_creator"]
+    task = crew.tasks_config["create_linkedin_post_task"]
+    return [
+        {"role": "system", "content": f"You are {agent['role']}. {agent['backstory']}\nYour goal: {agent['goal']}".format(topic=topic)},
+        {"role": "user", "content": f"{task['description']}\nExpected output: {task['expected_output']}".format(topic=topic)},
+    ]
+
+
+def generate_batched(topic, variants, agent_llm):
+    """Generate all variants with one completion request asking for `variants` choices"""
+    with trace_span("post variants", kind="llm", topic=topic, variants=variants, mode="batched") as span:
+        response = litellm.completion(
+            model=agent_llm.model,
+            api_key=agent_llm.api_key,
+            messages=_post_messages(topic),
+            n=variants,
+            temperature=VARIANT_TEMPERATURE
+        )
+        record_token_usage(span, response)
+    return [choice.message.content.strip() for choice in response.choices if choice.message.content]
+
+
+def generate_pooled(topic, variants, agent_llm=None, max_workers=POST_VARIANT_WORKERS):
+    """Generate variants with concurrent post creator crews, keeping the ones that succeed"""
+
+    def create_variant(index):
+        with trace_span("post creator", kind="crew", topic=topic, variant=index) as span:
+            post = kickoff_crew(LinkedInPostCreator(agent_llm=agent_llm), {"topic": topic})
+            record_token_usage(span, post)
+        return post.raw
+
+    def run(index):
+        try:
+            return create_variant(index)
+        except Exception as e:
+            print(f"Post variant {index} failed: {e}")
+            return None
+
+    # Each worker runs in a copy of the caller's context to stay in the current trace
+    with ThreadPoolExecutor(max_workers=min(max_workers, variants)) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, run, index) for index in range(variants)]
+        return [post for post in (future.result() for future in futures) if post]
+
+
+def generate_post_variants(topic, variants, agent_llm=None):
+    """
+    Generate several posts about the same topic concurrently.
+
+    Parameters:
+    - topic: Topic of the posts
+    - variants: Number of posts to generate
+    - agent_llm: Optional - LLM to use, defaults to the configured one
+
+    Returns:
+    - List of post texts in markdown, possibly fewer than requested if some failed
+    """
+    agent_llm = agent_llm or llm
+    if supports_batched_variants(agent_llm):
+        try:
+            posts = generate_batched(topic, variants, agent_llm)
+            if posts:
+                return posts
+        except Exception as e:
+            print(f"Batched variant generation failed, falling back to parallel crews: {e}")
+
+    posts = generate_pooled(topic, variants, agent_llm)
+    if not posts:
+        raise Exception(f"Every post variant failed for topic: {topic}")
+    return posts
+
+
+def run_benchmark(variants=4, latency=0.5):
+    """Compare the wall time of one post with the wall time of K pooled variants on stub LLMs"""
+    import time
+    from ai_agents.stub_llm import StubLLM
+
+    topic = "Benchmark topic"
+    started = time.perf_counter()
+    generate_pooled(topic, 1, StubLLM(topic=topic, latency=latency))
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    posts = generate_pooled(topic, variants, StubLLM(topic=topic, latency=latency))
+    pooled = time.perf_counter() - started
+
+    print(f"stub latency: {latency}s per LLM call")
+    print(f"1 post:            {single:.2f}s")
+    print(f"{variants} variants ({len(posts)} ok): {pooled:.2f}s ({pooled / single:.2f}x a single post)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,19 +1,63 @@
 from dotenv import load_dotenv, find_dotenv
-from crewai.flow.flow import Flow, listen, start
+from crewai.flow.flow import Flow, FlowState, listen, start
 from flask import Flask
 from ai_agents.linkedin_topic_creator.topic_creator_crew import LinkedInTopicCreator
 from ai_agents.linkedin_create_post.create_post_crew import LinkedInPostCreator
+from ai_agents.linkedin_create_post.post_variants import generate_post_variants
+from ai_agents.linkedin_fused_post.fused_post_crew import LinkedInFusedPostCreator
+from ai_agents.crew_cache import kickoff_crew
+from config.config import DEFAULT_USER_PROFILE
+from helpers.tracing import trace_span, record_token_usage
+from helpers.post_scoring import rank_posts
+from helpers.reformat_md_files import convert_md_to_linkedin_format
 
 load_dotenv(find_dotenv())
 app = Flask(__name__)
 
 
-class LinkedInFlow(Flow):
-    input_variables = {}
+class LinkedInPostState(FlowState):
+    user_profile: str = DEFAULT_USER_PROFILE
+    topic: str = ""
+    post: str = ""
+    # Set by the fused mode only
+    image_prompt: str = ""
+    # Every generated variant, best first, as {"post": markdown, "scores": {...}}
+    variants: list = []
+
+
+class LinkedInFlow(Flow[LinkedInPostState]):
+    """
+    Generates a topic, then a post about it. All run data lives in the per-instance
+    state, so separate instances can run concurrently in one process.
+
+    In the "crews" mode the topic and the post come from two crews. In the "fused" mode
+    one agent writes both, plus an image prompt, in a single structured task.
+    """
+
+    def __init__(self, agent_llm=None, user_profile=None, variants=1, mode="crews", **kwargs):
+        # Optional LLM shared by both crews, e.g. a streaming client for draft previews
+        self.agent_llm = agent_llm
+        # Number of post variants to generate concurrently, the best scoring one is kept
+        self.variants = variants
+        if mode not in ("crews", "fused"):
+            raise Exception(f"Unknown content mode: {mode}")
+        self.mode = mode
+        if user_profile:
+            # Who the topics are brainstormed for, e.g. an account's topic profile
+            kwargs["user_profile"] = user_profile
+        super().__init__(**kwargs)
 
     @start()
     def generate_research_topic(self):
-        return LinkedInTopicCreator().crew().kickoff()
+        if self.mode == "fused":
+            return self.generate_fused_post()
+
+        with trace_span("topic creator", kind="crew") as span:
+            topic = kickoff_crew(
+                LinkedInTopicCreator(agent_llm=self.agent_llm), {"user_profile": self.state.user_profile}
+            )
+            record_token_usage(span, topic)
+        return topic
 
     @listen(generate_research_topic)
     def create_linkedin_post(self, topic):
@@ -28,9 +72,46 @@ class LinkedInFlow(Flow):
             # Fallback to string representation
             topic_content = str(topic)
 
-        self.input_variables['topic'] = topic_content.strip('"')
-        print(f"Generated LinkedIn Topic: {self.input_variables}")
-        return LinkedInPostCreator().crew().kickoff(self.input_variables).raw
+        self.state.topic = topic_content.strip('"')
+        print(f"Generated LinkedIn Topic: {self.state.topic}")
+        if self.variants > 1:
+            return self.select_best_variant()
+        if self.state.post:
+            # Already written by the fused crew
+            return self.state.post
+
+        with trace_span("post creator", kind="crew", topic=self.state.topic) as span:
+            post = kickoff_crew(LinkedInPostCreator(agent_llm=self.agent_llm), {"topic": self.state.topic})
+            record_token_usage(span, post)
+        self.state.post = post.raw
+        return self.state.post
+
+    def generate_fused_post(self):
+        """Topic, post and image prompt from the single-task fused crew, returns the topic"""
+        with trace_span("fused post creator", kind="crew") as span:
+            output = kickoff_crew(
+                LinkedInFusedPostCreator(agent_llm=self.agent_llm), {"user_profile": self.state.user_profile}
+            )
+            record_token_usage(span, output)
+        if output.pydantic is None:
+            raise Exception(f"Fused crew output does not match the schema: {output.raw[:200]}")
+
+        self.state.post = output.pydantic.post_markdown.strip()
+        self.state.image_prompt = output.pydantic.image_prompt.strip()
+        return output.pydantic.topic
+
+    def select_best_variant(self):
+        # A fused run has already written one of the variants
+        posts = [self.state.post] if self.state.post else []
+        posts += generate_post_variants(self.state.topic, self.variants - len(posts), self.agent_llm)
+        # Score the text as it will be published, i.e. after markdown conversion
+        ranked = rank_posts(posts, text=convert_md_to_linkedin_format)
+
+        self.state.variants = [{"post": post, "scores": scores} for post, scores in ranked]
+        self.state.post = self.state.variants[0]["post"]
+        print(f"Selected the best of {len(posts)} post variants, score {ranked[0][1]['score']}")
+        return self.state.post
+
 
 ## This is optional,
 ## but uncomment if you want to run the Flask server locally
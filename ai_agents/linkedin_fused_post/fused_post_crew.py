@@ -0,0 +1,117 @@
+from crewai import Agent, Crew, Task, Process
+from crewai.project import CrewBase, agent, crew, task
+from pydantic import BaseModel, Field
+from ai_agents.linkedin_topic_creator.topic_creator_crew import SearchTool
+from config.llm_config import llm
+from helpers.tracing import trace_step, trace_task
+
+BENCHMARK_PROFILES = [
+    "I am software engineer with a focus on AI consulting, specializing in helping small and mid-sized "
+    "businesses leverage AI technologies to improve their operations and decision-making processes.",
+    "I run a two-person agency that automates back-office work for accounting firms with LLMs.",
+    "I am a data engineer helping retailers forecast demand and plan inventory with machine learning.",
+    "I advise manufacturing SMBs on computer vision for quality control on the production line.",
+    "I coach non-technical founders on buying, evaluating and rolling out AI tools safely.",
+]
+
+
+class FusedPost(BaseModel):
+    """Schema of the fused crew's output"""
+    topic: str = Field(description="Topic of the post, a concise, simple sentence")
+    post_markdown: str = Field(description="Ready-to-publish LinkedIn post in markdown, under 3000 characters")
+    image_prompt: str = Field(description="Prompt for an editorial illustration of the post, without text in the image")
+
+
+@CrewBase
+class LinkedInFusedPostCreator:
+    """Single agent choosing the topic and writing the post in one task, with a validated structured output"""
+
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/tasks.yaml'
+
+    def __init__(self, agent_llm=None):
+        super().__init__()
+        self.agent_llm = agent_llm or llm
+
+    @agent
+    def linkedin_post_writer(self) -> Agent:
+        return Agent(
+            config=self.agents_config['linkedin_post_writer'],
+            tools=[SearchTool()],
+            llm=self.agent_llm,
+            verbose=False
+        )
+
+    @task
+    def create_fused_post_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['create_fused_post_task'],
+            output_pydantic=FusedPost,
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        return Crew(
+            agents=[self.linkedin_post_writer()],
+            tasks=[self.create_fused_post_task()],
+            process=Process.sequential,
+            verbose=False,
+            step_callback=trace_step,
+            task_callback=trace_task,
+        )
+
+
+def run_benchmark(profiles=BENCHMARK_PROFILES, agent_llm=None):
+    """
+    Run the two-crew and the fused flow on the same user profiles and compare latency,
+    token usage and post quality (the local post_scoring heuristics).
+    Uses the configured LLM when OPENAI_API_KEY is set, offline stub LLMs otherwise,
+    which only exercise the plumbing and report no tokens.
+    """
+    import os
+    import statistics
+    import time
+    from ai_agents.linkedin_create_post_flow import LinkedInFlow
+    from helpers.post_scoring import score_post
+    from helpers.reformat_md_files import convert_md_to_linkedin_format
+    from helpers.tracing import trace_run, current_token_usage
+
+    stub = agent_llm is None and not os.getenv("OPENAI_API_KEY")
+    if stub:
+        from ai_agents.stub_llm import StubLLM
+        # The search tool needs a key to be constructed, the stub never calls it
+        os.environ.setdefault("SERPER_API_KEY", "stub")
+        print("OPENAI_API_KEY is not set, running on stub LLMs")
+
+    results = {}
+    for mode in ("crews", "fused"):
+        runs = []
+        for index, profile in enumerate(profiles):
+            run_llm = StubLLM(topic=f"Benchmark topic {index}", latency=0.5) if stub else agent_llm
+            with trace_run(f"benchmark:{mode}:{index}"):
+                started = time.perf_counter()
+                post = LinkedInFlow(agent_llm=run_llm, user_profile=profile, mode=mode).kickoff()
+                seconds = time.perf_counter() - started
+                tokens = current_token_usage()
+            runs.append({
+                "seconds": seconds,
+                "total_tokens": tokens.get("total_tokens", 0),
+                "llm_requests": tokens.get("llm_requests", 0),
+                "score": score_post(convert_md_to_linkedin_format(post))["score"],
+            })
+        results[mode] = runs
+
+    print(f"{len(profiles)} profiles per mode")
+    print(f"{'mode':<6} {'median s':>9} {'tokens':>8} {'requests':>9} {'score':>6}")
+    for mode, runs in results.items():
+        print(
+            f"{mode:<6} {statistics.median(run['seconds'] for run in runs):>9.2f}"
+            f" {statistics.mean(run['total_tokens'] for run in runs):>8.0f}"
+            f" {statistics.mean(run['llm_requests'] for run in runs):>9.1f}"
+            f" {statistics.mean(run['score'] for run in runs):>6.3f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -7,6 +7,7 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.tasks.task_output import TaskOutput
 from crewai_tools import DallETool
+from helpers.tracing import trace_step, trace_task
 
 @CrewBase
 class ImageGeneratorCrew:
@@ -39,6 +40,8 @@ class ImageGeneratorCrew:
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
             verbose=False,
+            step_callback=trace_step,
+            task_callback=trace_task,
         )
 
     def _print_output(self, output: TaskOutput):
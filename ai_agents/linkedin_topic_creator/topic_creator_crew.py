@@ -4,6 +4,7 @@ from dotenv import load_dotenv, find_dotenv
 from langchain_community.utilities import GoogleSerperAPIWrapper
 from crewai.tools import BaseTool
 from pydantic import Field
+from helpers.tracing import trace_step, trace_task
 
 load_dotenv(find_dotenv())
 
@@ -30,11 +31,17 @@ class LinkedInTopicCreator:
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
+    def __init__(self, agent_llm=None):
+        super().__init__()
+        # None falls back to crewAI's default LLM
+        self.agent_llm = agent_llm
+
     @agent
     def topic_generator_agent(self) -> Agent:
         return Agent(
             config=self.agents_config['topic_generator_agent'], # type: ignore[index]
             tools=[SearchTool()],
+            llm=self.agent_llm,
             verbose=True
         )
 
@@ -52,6 +59,8 @@ class LinkedInTopicCreator:
             tasks=self.tasks,    # Automatically collected by the @task decorator.
             process=Process.sequential,
             verbose=True,
+            step_callback=trace_step,
+            task_callback=trace_task,
         )
 
 def run_crew():
@@ -0,0 +1,63 @@
+import json
+import re
+import time
+from crewai import BaseLLM
+from crewai.utilities.events import crewai_event_bus, LLMCallStartedEvent, LLMCallCompletedEvent, LLMCallType
+
+POST_TOPIC_PATTERN = re.compile(r"LinkedIn post about (.+?) for an intermediate audience")
+
+
+class StubLLM(BaseLLM):
+    """
+    Offline stand-in for the crews' LLM, for stress and soak runs without API calls.
+    Topic prompts get the configured topic back; post prompts get a post written
+    about whatever topic the prompt itself mentions; fused prompts get the configured
+    topic, a post about it and an image prompt as JSON.
+    """
+
+    def __init__(self, topic="Stub topic", latency=0.0):
+        super().__init__(model="stub")
+        self.topic = topic
+        self.latency = latency
+        self.calls = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        self.calls += 1
+        # Emit the same events as crewAI's LLM so tracing and streaming listeners see the call
+        crewai_event_bus.emit(self, event=LLMCallStartedEvent(messages=messages, tools=tools))
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = messages if isinstance(messages, str) else "\n".join(
+            str(message.get("content", "")) for message in messages
+        )
+        post_topic = POST_TOPIC_PATTERN.search(prompt)
+        if "image_prompt" in prompt:
+            answer = json.dumps({
+                "topic": self.topic,
+                "post_markdown": self._post(self.topic),
+                "image_prompt": f"Editorial illustration about {self.topic}, no text"
+            })
+        elif post_topic:
+            answer = self._post(post_topic.group(1))
+        else:
+            answer = f'"{self.topic}"'
+
+        response = f"Thought: I now know the final answer\nFinal Answer: {answer}"
+        crewai_event_bus.emit(self, event=LLMCallCompletedEvent(response=response, call_type=LLMCallType.LLM_CALL))
+        return response
+
+    @staticmethod
+    def _post(topic):
+        return (
+            f"# {topic}\n\n"
+            f"Here is why {topic} matters for small and mid-sized businesses.\n\n"
+            "- Start small\n- Measure results\n\n"
+            "What is your experience? #AI #SMB"
+        )
+
+    def supports_function_calling(self):
+        return False
+
+    def get_context_window_size(self):
+        return 128000
@@ -0,0 +1,173 @@
+"""
+Generate a batch of LinkedIn drafts from the command line and write them as NDJSON for review.
+
+Example:
+    python bulk_generate.py --count 12 --concurrency 4 --images --output drafts.ndjson
+
+Rerunning the same command resumes an interrupted batch: drafts already in the
+output file are kept and only the missing ones are generated.
+"""
+import argparse
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from dotenv import load_dotenv
+from ai_agents.linkedin_create_post_flow import LinkedInFlow
+from ai_agents.linkedin_image_generator.crew import ImageGeneratorCrew
+from ai_agents.crew_cache import kickoff_crew
+from helpers.direct_image import generate_image_direct
+from helpers.post_scoring import hook_line
+from helpers.reformat_md_files import convert_md_to_linkedin_format
+from helpers.post_length import enforce_length
+from helpers.tracing import trace_run, trace_span, record_token_usage, current_token_usage
+
+load_dotenv()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate LinkedIn drafts in bulk as NDJSON")
+    parser.add_argument("--count", type=int, required=True, help="Number of drafts in the batch")
+    parser.add_argument("--output", default="drafts.ndjson", help="NDJSON file the drafts are appended to")
+    parser.add_argument("--concurrency", type=int, default=4, help="Drafts generated at the same time")
+    parser.add_argument("--images", action="store_true", help="Also generate an image for every draft")
+    parser.add_argument("--image-mode", choices=["direct", "ai"], default="direct",
+                        help="One direct image API call per draft, or the agent-based image crew")
+    parser.add_argument("--content-mode", choices=["crews", "fused"], default="crews",
+                        help="Topic and post from two crews, or from one structured task")
+    parser.add_argument("--variants", type=int, default=1, help="Post variants per draft, the best scoring one is kept")
+    parser.add_argument("--user-profile", help="Who the topics are brainstormed for, defaults to the configured profile")
+    parser.add_argument("--dry-run", action="store_true", help="Use an offline stub LLM instead of the real one")
+    return parser.parse_args(argv)
+
+
+def load_completed(path):
+    """
+    Read the drafts already written by a previous run of the batch.
+    A trailing partial line left by an interrupted write is cut off.
+
+    Returns:
+    - Set of completed draft indexes
+    """
+    if not os.path.exists(path):
+        return set()
+
+    completed = set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+
+    for line in data.splitlines():
+        try:
+            completed.add(json.loads(line)["index"])
+        except (ValueError, KeyError):
+            continue
+    return completed
+
+
+def generate_draft(index, args):
+    """Generate one draft: topic, LinkedIn-formatted text and optionally an image"""
+    agent_llm = None
+    if args.dry_run:
+        from ai_agents.stub_llm import StubLLM
+        agent_llm = StubLLM(topic=f"Dry run topic {index}", latency=0.2)
+
+    started = time.perf_counter()
+    with trace_run(f"bulk:{index}"):
+        flow = LinkedInFlow(
+            agent_llm=agent_llm, user_profile=args.user_profile, variants=args.variants, mode=args.content_mode
+        )
+        content = flow.kickoff()
+        formatted_content = enforce_length(convert_md_to_linkedin_format(content))
+
+        image_url = None
+        if args.images and not args.dry_run and args.image_mode == "direct":
+            image_url = generate_image_direct(
+                flow.state.topic, hook_line(formatted_content), prompt=flow.state.image_prompt or None
+            )
+        elif args.images and not args.dry_run:
+            with trace_span("image generator", kind="crew") as span:
+                image_output = kickoff_crew(ImageGeneratorCrew())
+                record_token_usage(span, image_output)
+            image_url = str(image_output).strip()
+        token_usage = current_token_usage()
+
+    return {
+        "index": index,
+        "topic": flow.state.topic,
+        "content": content,
+        "formatted_content": formatted_content,
+        "image_url": image_url,
+        "scores": flow.state.variants[0]["scores"] if flow.state.variants else None,
+        "token_usage": token_usage,
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def run_batch(args):
+    """
+    Generate the drafts of the batch that are not in the output file yet.
+
+    Returns:
+    - Report with the number of generated, skipped and failed drafts and runs per minute
+    """
+    if args.dry_run:
+        # The search tool needs a key to be constructed, the stub never calls it
+        os.environ.setdefault("SERPER_API_KEY", "stub")
+
+    completed = load_completed(args.output)
+    pending = [index for index in range(args.count) if index not in completed]
+    print(f"Batch of {args.count} drafts: {len(completed)} already done, {len(pending)} to generate")
+
+    write_lock = threading.Lock()
+    generated, failed = 0, []
+    started = time.perf_counter()
+
+    with open(args.output, "a") as output, ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(contextvars.copy_context().run, generate_draft, index, args): index
+            for index in pending
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                draft = future.result()
+            except Exception as e:
+                print(f"Draft {index} failed: {e}")
+                failed.append(index)
+                continue
+
+            # One flushed line per draft, so an interrupted batch loses at most the drafts in flight
+            with write_lock:
+                output.write(json.dumps(draft) + "\n")
+                output.flush()
+            generated += 1
+            print(f"Draft {index} done in {draft['elapsed_seconds']}s: {draft['topic']}")
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "generated": generated,
+        "skipped": len(completed),
+        "failed": sorted(failed),
+        "elapsed_seconds": round(elapsed, 2),
+        "runs_per_minute": round(generated / elapsed * 60, 1) if elapsed else None
+    }
+    print(json.dumps(report))
+    return report
+
+
+def main(argv=None):
+    report = run_batch(parse_args(argv))
+    if report["failed"]:
+        print(f"{len(report['failed'])} drafts failed, rerun the same command to retry them")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,4 +22,10 @@ LINKEDIN_INPUT_VARIABLES = {
     "audience_level": "intermediate",
     "topic": "Automated reasoning",
     "date": datetime.now().strftime("%Y-%m"),
-}
\ No newline at end of file
+}
+
+# Profile used to brainstorm topics when an account has none of its own
+DEFAULT_USER_PROFILE = (
+    "I am software engineer with a focus on AI consulting, specializing in helping small and mid-sized "
+    "businesses leverage AI technologies to improve their operations and decision-making processes."
+)
@@ -4,4 +4,13 @@ from .config import LLM_CONFIG
 llm = LLM(
     model=LLM_CONFIG["model"],
     api_key=LLM_CONFIG["api_key"]
-)
\ No newline at end of file
+)
+
+
+def build_llm(stream=False):
+    """Build a fresh LLM client from LLM_CONFIG, e.g. a streaming one scoped to a single run"""
+    return LLM(
+        model=LLM_CONFIG["model"],
+        api_key=LLM_CONFIG["api_key"],
+        stream=stream
+    )
@@ -0,0 +1,158 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pytz
+from pymongo import ASCENDING
+from helpers.schedules import DEFAULT_SCHEDULE, next_fire_time
+
+
+def ensure_account_indexes(accounts_collection):
+    """Index used by the schedule engine to reload only accounts changed since its last reload"""
+    accounts_collection.create_index([("updated_at", ASCENDING)])
+
+
+def add_account(accounts_collection, name, access_token, person_urn, topic_profile=None, schedule=None, image_mode=None, content_mode=None):
+    """
+    Register a LinkedIn member to publish for.
+
+    Parameters:
+    - name: Display name of the account
+    - access_token: LinkedIn OAuth access token of the member
+    - person_urn: LinkedIn member id (the part after urn:li:person:)
+    - topic_profile: Optional - description of the member used to brainstorm topics
+    - schedule: Optional - weekly schedule, see helpers.schedules.DEFAULT_SCHEDULE
+    - image_mode: Optional - "direct", "ai" or "card", defaults to the IMAGE_MODE setting
+    - content_mode: Optional - "crews" or "fused", defaults to the CONTENT_MODE setting
+
+    Returns:
+    - The id of the account document
+    """
+    schedule = schedule or DEFAULT_SCHEDULE
+    return accounts_collection.insert_one({
+        "name": name,
+        "access_token": access_token,
+        "person_urn": person_urn,
+        "topic_profile": topic_profile,
+        "image_mode": image_mode,
+        "content_mode": content_mode,
+        "schedule": schedule,
+        "active": True,
+        "created_at": datetime.now(),
+        "updated_at": datetime.now(),
+        "next_run_at": next_fire_time(schedule, datetime.now(pytz.utc))
+    }).inserted_id
+
+
+def update_account(accounts_collection, account_id, **fields):
+    """
+    Update an account, e.g. its schedule or active flag, and bump updated_at
+    so the schedule engine picks the change up on its next reload.
+    """
+    fields["updated_at"] = datetime.now()
+    if "schedule" in fields:
+        fields["next_run_at"] = next_fire_time(fields["schedule"], datetime.now(pytz.utc))
+    accounts_collection.update_one({"_id": account_id}, {"$set": fields})
+
+
+def mark_account_run(accounts_collection, account, now, error=None):
+    """Record the outcome of a fire and move the account to its next fire time"""
+    accounts_collection.update_one({"_id": account["_id"]}, {"$set": {
+        # Schedule engines reload the account and see its new next fire
+        "updated_at": datetime.now(),
+        "last_run_at": now,
+        "last_status": "failed" if error else "success",
+        "last_error": error,
+        "next_run_at": next_fire_time(account.get("schedule", DEFAULT_SCHEDULE), now)
+    }})
+
+
+class FanOut:
+    """
+    Publishes for many accounts on a long-lived bounded thread pool, isolating failures
+    per account. Reports only carry account ids and names, never credentials.
+    Submitting returns right away, so the scheduler tick that found the
+    accounts due never waits for a slow account, and an account whose previous publish
+    is still running is not submitted again.
+    """
+
+    def __init__(self, max_workers=8, history=200):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fan-out")
+        self._in_flight = set()
+        self._results = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def submit(self, accounts, publish):
+        """
+        Queue a publish for every account that is not already being published.
+
+        Parameters:
+        - accounts: Account documents to publish for
+        - publish: Callable taking one account; raising marks only that account as failed
+
+        Returns:
+        - Ids of the submitted accounts and of the ones skipped because still in flight
+        """
+        submitted, skipped = [], []
+        for account in accounts:
+            with self._lock:
+                if account["_id"] in self._in_flight:
+                    skipped.append(str(account["_id"]))
+                    continue
+                self._in_flight.add(account["_id"])
+            self.executor.submit(contextvars.copy_context().run, self._publish_one, account, publish)
+            submitted.append(str(account["_id"]))
+
+        if skipped:
+            print(f"Fan-out skipped {len(skipped)} accounts whose previous publish is still running")
+        return {"submitted": submitted, "skipped_in_flight": skipped}
+
+    def _publish_one(self, account, publish):
+        started_at = datetime.now()
+        started = time.perf_counter()
+        try:
+            publish(account)
+            error = None
+        except Exception as e:
+            error = str(e)
+        finally:
+            with self._lock:
+                self._in_flight.discard(account["_id"])
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._results.append({
+                "account_id": str(account["_id"]),
+                "name": account.get("name"),
+                "latency_seconds": round(latency, 3),
+                "status": "failed" if error else "success",
+                "error": error,
+                "started_at": started_at,
+                "finished_at": datetime.now()
+            })
+        print(f"Fan-out published for {account.get('name')} in {latency:.1f}s" + (f", failed: {error}" if error else ""))
+
+    def report(self):
+        """
+        Accounts in flight, plus outcome and latency of the latest finished publishes and
+        their throughput: publishes finished per minute between the first start and the last finish
+        """
+        with self._lock:
+            results = list(self._results)
+            in_flight = [str(account_id) for account_id in self._in_flight]
+        elapsed = (
+            max(result["finished_at"] for result in results) - min(result["started_at"] for result in results)
+        ).total_seconds() if results else 0
+        return {
+            "in_flight": in_flight,
+            "finished": len(results),
+            "succeeded": sum(1 for result in results if result["status"] == "success"),
+            "failed": sum(1 for result in results if result["status"] == "failed"),
+            "throughput_per_minute": round(len(results) / elapsed * 60, 2) if elapsed else 0,
+            "per_account": results
+        }
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
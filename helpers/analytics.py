@@ -0,0 +1,194 @@
+import math
+from datetime import datetime, timedelta
+
+# Latency sketch resolution: every estimated quantile is within 2% of a real sample
+SKETCH_RELATIVE_ACCURACY = 0.02
+SKETCH_MIN_SECONDS = 0.001
+
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+class LatencySketch:
+    """
+    Log-bucketed latency histogram with bounded relative error.
+
+    A value lands in bucket ceil(log_gamma(value)), so buckets are just counts keyed by
+    their index. Two sketches merge by adding counts, which lets daily rollups be
+    updated with $inc and combined over any date range without keeping raw samples.
+    """
+
+    def __init__(self, buckets=None):
+        self.buckets = {}
+        if buckets:
+            self.merge(buckets)
+
+    @staticmethod
+    def bucket(seconds):
+        return math.ceil(math.log(max(seconds, SKETCH_MIN_SECONDS)) / _LOG_GAMMA)
+
+    def add(self, seconds):
+        index = self.bucket(seconds)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, buckets):
+        """Add the counts of another sketch, given as {bucket index: count} with int or str keys"""
+        for index, count in buckets.items():
+            index = int(index)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    @property
+    def count(self):
+        return sum(self.buckets.values())
+
+    def quantile(self, q):
+        """Estimated q-quantile in seconds, or None for an empty sketch"""
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms
+                return round(2 * _GAMMA ** index / (_GAMMA + 1), 3)
+        return None
+
+
+def _day_key(moment):
+    return moment.strftime("%Y-%m-%d")
+
+
+def failure_cause(run, error):
+    """Short failure cause for the rollups, e.g. 'publish:HTTPError'"""
+    stage = (run or {}).get("failed_stage") or "unknown"
+    return f"{stage}:{type(error).__name__}"
+
+
+def record_post_outcome(rollup_collection, status, posted_at=None, stage_seconds=None,
+                        token_usage=None, failure_cause=None):
+    """
+    Fold one post outcome into the rollup document of its day with a single upsert.
+
+    Parameters:
+    - rollup_collection: Mongo collection with one document per day
+    - status: Post status, e.g. "success" or "failed"
+    - posted_at: Optional - when the post was written, defaults to now
+    - stage_seconds: Optional - {stage name: duration in seconds} of the run
+    - token_usage: Optional - crew token counts of the run
+    - failure_cause: Optional - cause of a failed post, see failure_cause()
+
+    Returns:
+    - The recorded outcome, {"day", "increments"}, to pass to revert_post_outcome if a
+      later attempt of the same run changes it
+    """
+    posted_at = posted_at or datetime.now()
+    increments = {"posts": 1, f"status.{status}": 1}
+
+    if failure_cause:
+        increments[f"failures.{failure_cause}"] = 1
+
+    stage_seconds = dict(stage_seconds or {})
+    if stage_seconds:
+        # Whole-run latency next to the individual stages
+        stage_seconds["total"] = sum(stage_seconds.values())
+    for stage, seconds in stage_seconds.items():
+        increments[f"latency.{stage}.{LatencySketch.bucket(seconds)}"] = 1
+
+    for key, value in (token_usage or {}).items():
+        if value:
+            increments[f"tokens.{key}"] = value
+
+    rollup_collection.update_one(
+        {"_id": _day_key(posted_at)},
+        {
+            "$inc": increments,
+            "$setOnInsert": {"weekday": WEEKDAYS[posted_at.weekday()]},
+            "$set": {"updated_at": datetime.now()}
+        },
+        upsert=True
+    )
+    # As pairs, the keys contain dots and cannot be stored as field names
+    return {"day": _day_key(posted_at), "increments": [[key, value] for key, value in increments.items()]}
+
+
+def revert_post_outcome(rollup_collection, outcome):
+    """Take back an outcome returned by record_post_outcome, e.g. a failure that a retry turned into a success"""
+    rollup_collection.update_one(
+        {"_id": outcome["day"]},
+        {"$inc": {key: -value for key, value in outcome["increments"]}, "$set": {"updated_at": datetime.now()}}
+    )
+
+
+def _empty_summary():
+    return {"posts": 0, "status": {}, "failures": {}, "tokens": {}, "_latency": {}}
+
+
+def _fold(summary, rollup):
+    summary["posts"] += rollup.get("posts", 0)
+    for field in ("status", "failures", "tokens"):
+        for key, value in rollup.get(field, {}).items():
+            summary[field][key] = summary[field].get(key, 0) + value
+    for stage, buckets in rollup.get("latency", {}).items():
+        summary["_latency"].setdefault(stage, LatencySketch()).merge(buckets)
+
+
+def _finish(summary, quantiles):
+    latency = summary.pop("_latency")
+    # Counts taken back by revert_post_outcome stay behind as zeros
+    for field in ("status", "failures"):
+        summary[field] = {key: value for key, value in summary[field].items() if value}
+    successes = summary["status"].get("success", 0)
+    summary["success_rate"] = round(successes / summary["posts"], 4) if summary["posts"] else None
+    summary["latency_seconds"] = {
+        stage: {
+            "count": sketch.count,
+            **{f"p{round(q * 100)}": sketch.quantile(q) for q in quantiles}
+        }
+        for stage, sketch in latency.items()
+    }
+    return summary
+
+
+def summarize(rollup_collection, start, end, group_by=None, quantiles=(0.5, 0.9, 0.99)):
+    """
+    Aggregate the daily rollups between two dates, reading only the rollup documents.
+
+    Parameters:
+    - rollup_collection: Mongo collection written by record_post_outcome
+    - start: First day, as a date or datetime
+    - end: Last day, included
+    - group_by: Optional - None for one summary, "day" or "weekday" for one summary per group
+    - quantiles: Latency quantiles to report
+
+    Returns:
+    - Summary with post counts, success rate, failure causes, token totals
+      and latency percentiles per stage, or a dict of such summaries per group
+    """
+    rollups = rollup_collection.find(
+        {"_id": {"$gte": _day_key(start), "$lte": _day_key(end)}}
+    ).sort("_id", 1)
+
+    if group_by not in (None, "day", "weekday"):
+        raise Exception(f"Unsupported analytics grouping: {group_by}")
+
+    groups = {}
+    for rollup in rollups:
+        key = rollup["_id"] if group_by == "day" else rollup.get("weekday") if group_by == "weekday" else "all"
+        _fold(groups.setdefault(key, _empty_summary()), rollup)
+
+    if group_by is None:
+        return _finish(groups.get("all", _empty_summary()), quantiles)
+
+    if group_by == "weekday":
+        groups = {day: groups[day] for day in WEEKDAYS if day in groups}
+    return {key: _finish(summary, quantiles) for key, summary in groups.items()}
+
+
+def default_range(days=30):
+    """The last `days` days, today included"""
+    end = datetime.now()
+    return end - timedelta(days=days - 1), end
@@ -0,0 +1,122 @@
+import base64
+import os
+from dotenv import load_dotenv
+from openai import OpenAI
+from helpers.tracing import trace_span
+
+load_dotenv()
+
+IMAGE_MODEL = os.getenv("IMAGE_MODEL", "dall-e-3")
+# dall-e-3's landscape size, the closest to LinkedIn's 1200x627 shared image
+IMAGE_SIZE = os.getenv("IMAGE_SIZE", "1792x1024")
+# "standard" or "hd", hd roughly doubles both cost and latency
+IMAGE_QUALITY = os.getenv("IMAGE_QUALITY", "standard")
+# Longest topic or headline put in the prompt, in characters
+MAX_PROMPT_FIELD = 300
+
+IMAGE_PROMPT_TEMPLATE = (
+    "A clean, modern editorial illustration for a LinkedIn post about {topic}. "
+    "The post opens with: \"{headline}\". "
+    "Professional style for a business audience, landscape composition with one clear focal point, "
+    "subtle technology motifs, no text, letters, logos or watermarks."
+)
+
+client = None
+
+
+def get_image_client():
+    """Shared OpenAI client, created on first use"""
+    global client
+    if client is None:
+        client = OpenAI()
+    return client
+
+
+def build_image_prompt(topic, headline):
+    """
+    Render IMAGE_PROMPT_TEMPLATE for a post.
+
+    Parameters:
+    - topic: Generated topic of the post, the headline is used when there is none
+    - headline: Opening line of the post
+
+    Returns:
+    - The image prompt
+    """
+    topic = " ".join((topic or headline or "artificial intelligence").split())[:MAX_PROMPT_FIELD]
+    headline = " ".join((headline or topic).split())[:MAX_PROMPT_FIELD].replace('"', "'")
+    return IMAGE_PROMPT_TEMPLATE.format(topic=topic, headline=headline)
+
+
+def generate_image_direct(topic, headline, response_format="url", image_client=None, prompt=None):
+    """
+    Generate the post image with a single image API call, without an agent deciding to call it.
+
+    Parameters:
+    - topic: Generated topic of the post
+    - headline: Opening line of the post
+    - response_format: "url" for a temporary URL, "b64_json" for the image bytes
+    - image_client: Optional - OpenAI client to use, defaults to the shared one
+    - prompt: Optional - ready image prompt, e.g. written by the fused crew, used instead of the template
+
+    Returns:
+    - The image URL, or the PNG bytes when response_format is "b64_json"
+    """
+    prompt = prompt or build_image_prompt(topic, headline)
+    with trace_span("image api", kind="image", model=IMAGE_MODEL, size=IMAGE_SIZE, quality=IMAGE_QUALITY):
+        response = (image_client or get_image_client()).images.generate(
+            model=IMAGE_MODEL,
+            prompt=prompt,
+            size=IMAGE_SIZE,
+            quality=IMAGE_QUALITY,
+            response_format=response_format,
+            n=1
+        )
+
+    image = response.data[0]
+    if response_format == "b64_json":
+        return base64.b64decode(image.b64_json)
+    if not image.url:
+        raise Exception("Image API returned no URL")
+    return image.url
+
+
+def run_benchmark(runs=3):
+    """
+    Compare the agent-based image crew with the direct image call on the real APIs:
+    wall time per image and the LLM tokens spent before the image API is called.
+    Needs OPENAI_API_KEY, every run generates two billable images.
+    """
+    import statistics
+    import time
+    from ai_agents.crew_cache import kickoff_crew
+    from ai_agents.linkedin_image_generator.crew import ImageGeneratorCrew
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("OPENAI_API_KEY is not set, the benchmark calls the real image API")
+        return
+
+    topic = "How small teams can ship AI features this quarter"
+    headline = "3 ways small teams can ship AI features this quarter"
+    results = {"crew": [], "direct": []}
+    tokens = []
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = kickoff_crew(ImageGeneratorCrew())
+        results["crew"].append(time.perf_counter() - started)
+        tokens.append(output.token_usage.total_tokens if output.token_usage else 0)
+
+        started = time.perf_counter()
+        generate_image_direct(topic, headline)
+        results["direct"].append(time.perf_counter() - started)
+
+    crew, direct = statistics.median(results["crew"]), statistics.median(results["direct"])
+    print(f"{runs} images per path, {IMAGE_MODEL} {IMAGE_SIZE} {IMAGE_QUALITY}")
+    print(f"crew:   {crew:.1f}s median, {statistics.mean(tokens):.0f} LLM tokens per image")
+    print(f"direct: {direct:.1f}s median, 0 LLM tokens per image")
+    print(f"saved:  {crew - direct:.1f}s per image ({(1 - direct / crew) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,114 @@
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+
+class CachedResponse:
+    """A serialized response body with its validators"""
+
+    __slots__ = ("body", "etag", "last_modified", "expires_at")
+
+    def __init__(self, body, etag, last_modified, expires_at):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def headers(self, max_age):
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": f"private, max-age={max_age}",
+        }
+
+
+class ResponseCache:
+    """
+    Short-TTL in-process cache of serialized read responses, keyed by endpoint.
+    Entries also carry ETag and Last-Modified validators for conditional GETs,
+    and hit, miss and 304 counts are kept per key.
+    """
+
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._entries = {}
+        self._validators = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key, outcome):
+        stats = self._stats.setdefault(key, {"hits": 0, "misses": 0, "not_modified": 0})
+        stats[outcome] += 1
+
+    def get(self, key):
+        """Get a fresh cached response, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires_at > time.time():
+                self._count(key, "hits")
+                return entry
+            self._count(key, "misses")
+            return None
+
+    def set(self, key, body, validator=None):
+        """
+        Cache a serialized body.
+
+        Parameters:
+        - key: Cache key, usually the endpoint
+        - body: Serialized response bytes
+        - validator: Optional - bytes the ETag is computed from instead of the body,
+          for responses that change on every call but whose meaning does not (weak ETag)
+
+        Returns:
+        - The CachedResponse
+        """
+        now = time.time()
+        digest = hashlib.sha1(validator if validator is not None else body).hexdigest()
+        etag = f'W/"{digest}"' if validator is not None else f'"{digest}"'
+
+        with self._lock:
+            # Last-Modified only moves when the content actually changed
+            previous_etag, last_modified = self._validators.get(key, (None, now))
+            if previous_etag != etag:
+                last_modified = now
+            self._validators[key] = (etag, last_modified)
+            entry = CachedResponse(body, etag, last_modified, now + self.ttl)
+            self._entries[key] = entry
+            return entry
+
+    def invalidate(self, *keys):
+        """Drop cached responses for the given keys, or all of them when none are given"""
+        with self._lock:
+            for key in keys or list(self._entries):
+                self._entries.pop(key, None)
+
+    def not_modified(self, key, entry, if_none_match=None, if_modified_since=None):
+        """Check a request's conditional headers against a cached response and count 304s"""
+        if if_none_match is not None:
+            matched = entry.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        elif if_modified_since is not None:
+            try:
+                matched = int(entry.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                matched = False
+        else:
+            matched = False
+
+        if matched:
+            with self._lock:
+                self._count(key, "not_modified")
+        return matched
+
+    def stats(self):
+        """Hit ratio and 304 counts per key"""
+        with self._lock:
+            return {
+                key: {
+                    **stats,
+                    "hit_ratio": round(stats["hits"] / (stats["hits"] + stats["misses"]), 3)
+                    if stats["hits"] + stats["misses"] else None
+                }
+                for key, stats in self._stats.items()
+            }
@@ -0,0 +1,172 @@
+import io
+import os
+import re
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+from helpers.post_scoring import hook_line
+
+# LinkedIn's recommended size for shared images
+CARD_SIZE = (1200, 627)
+CARD_MARGIN = 72
+MAX_CARD_BULLETS = 3
+
+# Optional TrueType fonts, Pillow's bundled scalable font is used otherwise
+CARD_FONT_PATH = os.getenv("CARD_FONT_PATH")
+CARD_BOLD_FONT_PATH = os.getenv("CARD_BOLD_FONT_PATH") or CARD_FONT_PATH
+
+CARD_TEMPLATES = {
+    "default": {"background": ((14, 36, 72), (10, 102, 194)), "accent": (112, 181, 249), "text": (255, 255, 255), "muted": (201, 222, 245)},
+    "dark": {"background": ((18, 18, 18), (48, 48, 56)), "accent": (0, 200, 150), "text": (245, 245, 245), "muted": (170, 170, 180)},
+    "light": {"background": ((250, 250, 252), (226, 234, 244)), "accent": (10, 102, 194), "text": (20, 28, 40), "muted": (80, 92, 110)},
+}
+
+BULLET_PATTERN = re.compile(r'^\s*(?:[•\-*]|\d+\.)\s+(.+)$')
+
+
+@lru_cache(maxsize=32)
+def _font(size, bold=False):
+    path = CARD_BOLD_FONT_PATH if bold else CARD_FONT_PATH
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size=size)
+
+
+@lru_cache(maxsize=8)
+def _background(template):
+    """Vertical gradient of a template, rendered once per process"""
+    top, bottom = CARD_TEMPLATES[template]["background"]
+    width, height = CARD_SIZE
+    gradient = Image.linear_gradient("L").resize((width, height))
+    return Image.composite(Image.new("RGB", CARD_SIZE, bottom), Image.new("RGB", CARD_SIZE, top), gradient)
+
+
+def extract_card_content(text, max_bullets=MAX_CARD_BULLETS):
+    """
+    Pick the card text from a post: its headline and its first list items.
+
+    Returns:
+    - (headline, list of bullets)
+    """
+    headline = hook_line(text)
+    bullets = []
+    for line in text.split("\n"):
+        match = BULLET_PATTERN.match(line)
+        if match:
+            bullet = re.sub(r'[*_`]+', '', match.group(1)).strip()
+            # Keep the part before the explanation, e.g. "Start small: ..." -> "Start small"
+            bullet = re.split(r'(?<=\w)[:—]\s| - ', bullet, maxsplit=1)[0]
+            bullets.append(bullet)
+            if len(bullets) == max_bullets:
+                break
+    return headline, bullets
+
+
+def _wrap(draw, text, font, width, max_lines):
+    """Greedy word wrap, ellipsizing the last line when the text does not fit"""
+    lines, current = [], ""
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if draw.textlength(candidate, font=font) <= width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        current = word
+        if len(lines) == max_lines:
+            break
+    if current and len(lines) < max_lines:
+        lines.append(current)
+
+    if len(lines) == max_lines and " ".join(lines) != " ".join(text.split()):
+        last = lines[-1]
+        while last and draw.textlength(last + "…", font=font) > width:
+            last = last[:-1]
+        lines[-1] = last.rstrip() + "…"
+    return lines
+
+
+def render_card(headline, bullets=(), template="default", brand=None, image_format="JPEG"):
+    """
+    Draw a branded LinkedIn card locally, without any network call.
+
+    Parameters:
+    - headline: Main text of the card
+    - bullets: Optional - up to MAX_CARD_BULLETS key points shown under the headline
+    - template: Name of a CARD_TEMPLATES entry
+    - brand: Optional - footer text, e.g. the account name
+    - image_format: JPEG, or PNG for lossless output at about three times the encoding cost
+
+    Returns:
+    - The encoded image bytes
+    """
+    colors = CARD_TEMPLATES.get(template, CARD_TEMPLATES["default"])
+    image = _background(template if template in CARD_TEMPLATES else "default").copy()
+    draw = ImageDraw.Draw(image)
+    width, height = CARD_SIZE
+    text_width = width - 2 * CARD_MARGIN
+
+    draw.rectangle([CARD_MARGIN, CARD_MARGIN, CARD_MARGIN + 96, CARD_MARGIN + 8], fill=colors["accent"])
+
+    # Largest headline size that fits in three lines
+    bullets = list(bullets)[:MAX_CARD_BULLETS]
+    for size in (64, 56, 48, 42):
+        font = _font(size, bold=True)
+        lines = _wrap(draw, headline, font, text_width, 3)
+        if not lines[-1].endswith("…"):
+            break
+
+    y = CARD_MARGIN + 40
+    for line in lines:
+        draw.text((CARD_MARGIN, y), line, font=font, fill=colors["text"])
+        y += int(size * 1.2)
+
+    bullet_font = _font(30)
+    y += 24
+    for bullet in bullets:
+        if y > height - CARD_MARGIN - 80:
+            break
+        draw.ellipse([CARD_MARGIN, y + 11, CARD_MARGIN + 12, y + 23], fill=colors["accent"])
+        line = _wrap(draw, bullet, bullet_font, text_width - 32, 1)[0]
+        draw.text((CARD_MARGIN + 32, y), line, font=bullet_font, fill=colors["muted"])
+        y += 48
+
+    if brand:
+        draw.text((CARD_MARGIN, height - CARD_MARGIN - 28), brand, font=_font(26, bold=True), fill=colors["accent"])
+
+    output = io.BytesIO()
+    image.save(output, format=image_format, **({"quality": 90} if image_format == "JPEG" else {}))
+    return output.getvalue()
+
+
+def render_post_card(text, template="default", brand=None):
+    """Render the card of a LinkedIn-formatted post, returns JPEG bytes"""
+    headline, bullets = extract_card_content(text)
+    return render_card(headline or brand or "", bullets, template=template, brand=brand)
+
+
+def run_benchmark(renders=200):
+    """Time card rendering for a typical post in every template"""
+    import time
+
+    post = (
+        "3 ways small teams can ship AI features this quarter\n\n"
+        "• Start small: pick one workflow with measurable time savings\n"
+        "• Measure results - track hours saved per week\n"
+        "• Iterate with your users before you scale\n\n"
+        "What would you automate first? #AI #SMB #Productivity"
+    )
+    for template in CARD_TEMPLATES:
+        render_post_card(post, template=template, brand="Ubiquitiz")
+        started = time.perf_counter()
+        for _ in range(renders):
+            card = render_post_card(post, template=template, brand="Ubiquitiz")
+        print(f"{template}: {(time.perf_counter() - started) / renders * 1e3:.1f} ms per card, {len(card) / 1024:.0f} KiB")
+
+    path = "/tmp/linkedin_card.jpg"
+    with open(path, "wb") as f:
+        f.write(render_post_card(post, brand="Ubiquitiz"))
+    print(f"sample card written to {path}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
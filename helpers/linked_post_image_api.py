@@ -1,18 +1,42 @@
 import requests
 import os
-from urllib.parse import urlparse
+from urllib.parse import urlparse, quote
 from dotenv import load_dotenv
+from helpers.rate_limiter import linkedin_rate_limiter
+from helpers.tracing import trace_span
 
 load_dotenv()
 ACCESS_TOKEN = os.getenv('LINKEDIN_ACCESS_TOKEN')
-def upload_image_from_url_to_linkedin(image_url):
+
+
+def linkedin_request(method, endpoint, url, access_token=None, **kwargs):
+    """
+    Call the LinkedIn API once the shared rate limiter lets the call through.
+
+    Parameters:
+    - method: HTTP method
+    - endpoint: Rate limit bucket of the call, e.g. "ugcPosts"
+    - url: Request URL
+    - access_token: Token the call is made with, used to pick the per-member bucket
+    - kwargs: Passed on to requests.request
+
+    Returns:
+    - The requests response
+    """
+    with trace_span(f"linkedin {method} {endpoint}", kind="http", endpoint=endpoint) as span:
+        span["attributes"]["rate_limit_wait_s"] = linkedin_rate_limiter.acquire(endpoint, access_token or ACCESS_TOKEN)
+        response = requests.request(method, url, **kwargs)
+        span["attributes"]["status_code"] = response.status_code
+        return response
+
+def upload_image_from_url_to_linkedin(image_url, access_token=None, person_urn=None):
     """
     Upload an image from a URL to LinkedIn's media platform and return the asset ID.
 
     Parameters:
-    - access_token: Your LinkedIn OAuth access token
     - image_url: URL of the image to upload
-    - organization_id: Optional - if posting as an organization
+    - access_token: Optional - LinkedIn OAuth access token, defaults to LINKEDIN_ACCESS_TOKEN
+    - person_urn: Optional - member id of the owner, defaults to PERSON_URN
 
     Returns:
     - asset_id: The ID of the uploaded image asset
@@ -22,11 +46,30 @@ def upload_image_from_url_to_linkedin(image_url):
     if image_response.status_code != 200:
         raise Exception(f"Failed to download image: {image_response.status_code}")
 
-    image_data = image_response.content
+    return upload_image_bytes_to_linkedin(
+        image_response.content, access_token=access_token, person_urn=person_urn
+    )
+
 
-    # Step 2: Register Upload with LinkedIn
+def upload_image_bytes_to_linkedin(image_data, content_type='image/jpeg', access_token=None, person_urn=None):
+    """
+    Upload image bytes, e.g. a locally rendered card, to LinkedIn's media platform.
+
+    Parameters:
+    - image_data: Encoded image
+    - content_type: MIME type of the image
+    - access_token: Optional - LinkedIn OAuth access token, defaults to LINKEDIN_ACCESS_TOKEN
+    - person_urn: Optional - member id of the owner, defaults to PERSON_URN
+
+    Returns:
+    - asset_id: The ID of the uploaded image asset
+    """
+    access_token = access_token or ACCESS_TOKEN
+    owner = f"urn:li:person:{person_urn}" if person_urn else os.getenv('PERSON_URN')
+
+    # Step 1: Register Upload with LinkedIn
     headers = {
-        'Authorization': f'Bearer {ACCESS_TOKEN}',
+        'Authorization': f'Bearer {access_token}',
         'X-Restli-Protocol-Version': '2.0.0',
         'Content-Type': 'application/json'
     }
@@ -37,7 +80,7 @@ def upload_image_from_url_to_linkedin(image_url):
     register_data = {
         "registerUploadRequest": {
             "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-            "owner": f"{os.getenv('PERSON_URN')}",
+            "owner": f"{owner}",
             "serviceRelationships": [
                 {
                     "relationshipType": "OWNER",
@@ -47,7 +90,9 @@ def upload_image_from_url_to_linkedin(image_url):
         }
     }
 
-    register_response = requests.post(register_url, headers=headers, json=register_data)
+    register_response = linkedin_request(
+        'POST', 'assets', register_url, access_token=access_token, headers=headers, json=register_data
+    )
 
     if register_response.status_code != 200:
         raise Exception(f"Failed to register upload: {register_response.text}")
@@ -60,12 +105,15 @@ def upload_image_from_url_to_linkedin(image_url):
     register_data['value']['uploadMechanism']['com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
     asset_id = register_data['value']['asset']
 
-    # Step 3: Upload the image binary to the provided URL
-    upload_response = requests.put(
+    # Step 2: Upload the image binary to the provided URL
+    upload_response = linkedin_request(
+        'PUT',
+        'upload',
         upload_url,
+        access_token=access_token,
         data=image_data,
         headers={
-            'Content-Type': 'image/jpeg'
+            'Content-Type': content_type
         }
     )
 
@@ -131,27 +179,28 @@ def prepare_image_upload(image_url):
         "register_data": register_data
     }
 
-def create_linkedin_post_with_image(text, asset_id):
+def create_linkedin_post_with_image(text, asset_id, access_token=None, person_urn=None):
     """
     Create a LinkedIn post that includes the uploaded image
 
     Parameters:
-    - access_token: Your LinkedIn OAuth access token
     - text: Text content of the post
     - asset_id: Asset ID returned from image upload
-    - organization_id: Optional - if posting as an organization
+    - access_token: Optional - LinkedIn OAuth access token, defaults to LINKEDIN_ACCESS_TOKEN
+    - person_urn: Optional - member id of the author, defaults to LINKEDIN_PERSON_URN
 
     Returns:
     - Response from LinkedIn post-creation API
     """
+    access_token = access_token or ACCESS_TOKEN
     headers = {
-        'Authorization': f'Bearer {ACCESS_TOKEN}',
+        'Authorization': f'Bearer {access_token}',
         'X-Restli-Protocol-Version': '2.0.0',
         'Content-Type': 'application/json'
     }
 
     # Define the author based on whether it's a person or org post
-    author = f"urn:li:person:{os.getenv('LINKEDIN_PERSON_URN')}"
+    author = f"urn:li:person:{person_urn or os.getenv('LINKEDIN_PERSON_URN')}"
 
     post_data = {
         "author": author,
@@ -176,9 +225,46 @@ def create_linkedin_post_with_image(text, asset_id):
     }
 
     post_url = "https://api.linkedin.com/v2/ugcPosts"
-    post_response = requests.post(post_url, headers=headers, json=post_data)
+    post_response = linkedin_request(
+        'POST', 'ugcPosts', post_url, access_token=access_token, headers=headers, json=post_data
+    )
 
     if post_response.status_code not in [200, 201]:
         raise Exception(f"Failed to create post: {post_response.status_code}, {post_response.text}")
 
     return post_response.json()
+
+
+def find_recent_post_by_text(text, count=10, access_token=None, person_urn=None):
+    """
+    Look for a recent post by the configured member whose commentary matches the given text.
+    Used to detect posts that were published even though the create response was lost.
+
+    Parameters:
+    - text: Text content of the post
+    - count: Number of recent posts to inspect
+    - access_token: Optional - LinkedIn OAuth access token, defaults to LINKEDIN_ACCESS_TOKEN
+    - person_urn: Optional - member id of the author, defaults to LINKEDIN_PERSON_URN
+
+    Returns:
+    - Dictionary with the post "id", or None if no matching post was found
+    """
+    access_token = access_token or ACCESS_TOKEN
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'X-Restli-Protocol-Version': '2.0.0'
+    }
+
+    author = quote(f"urn:li:person:{person_urn or os.getenv('LINKEDIN_PERSON_URN')}", safe='')
+    posts_url = f"https://api.linkedin.com/v2/ugcPosts?q=authors&authors=List({author})&sortBy=CREATED&count={count}"
+    posts_response = linkedin_request('GET', 'ugcPosts', posts_url, access_token=access_token, headers=headers)
+
+    if posts_response.status_code != 200:
+        raise Exception(f"Failed to list posts: {posts_response.status_code}, {posts_response.text}")
+
+    for element in posts_response.json().get('elements', []):
+        share_content = element.get('specificContent', {}).get('com.linkedin.ugc.ShareContent', {})
+        if share_content.get('shareCommentary', {}).get('text', '').strip() == text.strip():
+            return {"id": element.get('id')}
+
+    return None
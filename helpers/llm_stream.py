@@ -0,0 +1,63 @@
+import contextvars
+import json
+import queue
+import threading
+from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+
+# Streaming LLM clients currently being listened to, keyed by id(llm)
+_chunk_queues = {}
+_chunk_queues_lock = threading.Lock()
+_DONE = object()
+
+
+@crewai_event_bus.on(LLMStreamChunkEvent)
+def _dispatch_stream_chunk(source, event):
+    """Route a streamed chunk to the run that owns the emitting LLM client"""
+    if not event.chunk:
+        return
+    with _chunk_queues_lock:
+        events = _chunk_queues.get(id(source))
+    if events is not None:
+        events.put(("token", event.chunk))
+
+
+def stream_llm_run(stream_llm, run):
+    """
+    Execute a blocking run in a worker thread and yield its tokens as they arrive.
+
+    Parameters:
+    - stream_llm: LLM client built with stream=True and used only by this run
+    - run: Callable performing the generation (e.g. LinkedInFlow(...).kickoff)
+
+    Yields:
+    - ("token", chunk) for every chunk streamed by stream_llm
+    - ("result", value) with the return value of run, or ("error", message) if it raised
+    """
+    events = queue.Queue()
+    with _chunk_queues_lock:
+        _chunk_queues[id(stream_llm)] = events
+
+    def worker():
+        try:
+            events.put(("result", run()))
+        except Exception as e:
+            events.put(("error", str(e)))
+        finally:
+            events.put(_DONE)
+
+    # Run in a copy of the caller's context so the worker keeps its trace run
+    threading.Thread(target=contextvars.copy_context().run, args=(worker,), daemon=True).start()
+    try:
+        while True:
+            item = events.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        with _chunk_queues_lock:
+            _chunk_queues.pop(id(stream_llm), None)
+
+
+def format_sse(event, data):
+    """Format a single server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
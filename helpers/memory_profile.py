@@ -0,0 +1,134 @@
+import gc
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Opt in with MEMORY_PROFILING=true, tracing every allocation slows the process down
+MEMORY_PROFILING = os.getenv("MEMORY_PROFILING", "").lower() in ("1", "true", "yes")
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "5"))
+MEMORY_TOP_SITES = 15
+MEMORY_REPORTS_KEPT = 20
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Allocations made by the profiler itself are left out of the diffs
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def rss_bytes():
+    """Resident set size of the process, from /proc when available, else the peak RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def object_counts(top=20):
+    """Number of live objects tracked by the garbage collector, per type, most common first"""
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return dict(counts.most_common(top))
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES
+    ])
+
+
+class MemoryProfiler:
+    """
+    Records memory around tracked runs: RSS before and after, the traced memory the run
+    retained, and the allocation sites that grew the most between a snapshot taken
+    before the run and one taken after it (after a full collection).
+    """
+
+    def __init__(self, enabled=MEMORY_PROFILING, frames=MEMORY_TRACE_FRAMES):
+        self.enabled = enabled
+        self.frames = frames
+        self.reports = deque(maxlen=MEMORY_REPORTS_KEPT)
+        self.runs = 0
+        self.baseline_rss = None
+        # Snapshots are process-wide, so tracked runs are measured one at a time
+        self._lock = threading.Lock()
+        if enabled:
+            self.start()
+
+    def start(self):
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.baseline_rss = self.baseline_rss or rss_bytes()
+
+    @contextmanager
+    def track(self, label):
+        """Measure the memory a block retains, a no-op unless profiling is enabled"""
+        if not self.enabled or not self._lock.acquire(blocking=False):
+            yield
+            return
+
+        try:
+            gc.collect()
+            rss_before = rss_bytes()
+            before = _snapshot()
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                seconds = time.perf_counter() - started
+                gc.collect()
+                after = _snapshot()
+                self._record(label, before, after, rss_before, seconds)
+        finally:
+            self._lock.release()
+
+    def _record(self, label, before, after, rss_before, seconds):
+        diff = after.compare_to(before, "lineno")
+        rss_after = rss_bytes()
+        self.runs += 1
+        self.reports.append({
+            "label": label,
+            "run": self.runs,
+            "finished_at": datetime.now().isoformat(),
+            "seconds": round(seconds, 3),
+            "rss_before": rss_before,
+            "rss_after": rss_after,
+            "rss_delta": rss_after - rss_before,
+            "traced_delta": sum(stat.size_diff for stat in diff),
+            "top_allocations": [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in diff[:MEMORY_TOP_SITES]
+                if stat.size_diff
+            ],
+        })
+
+    def report(self, top_types=20):
+        """Current gauges plus the reports of the latest tracked runs"""
+        rss = rss_bytes()
+        traced, traced_peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+        return {
+            "enabled": self.enabled,
+            "rss": rss,
+            "rss_growth": rss - self.baseline_rss if self.baseline_rss else None,
+            "traced_current": traced,
+            "traced_peak": traced_peak,
+            "gc_counts": gc.get_count(),
+            "object_counts": object_counts(top_types),
+            "tracked_runs": self.runs,
+            "mean_retained_per_run": (
+                round(sum(report["traced_delta"] for report in self.reports) / len(self.reports))
+                if self.reports else None
+            ),
+            "runs": list(self.reports),
+        }
+
+
+memory_profiler = MemoryProfiler()
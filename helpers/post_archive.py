@@ -0,0 +1,283 @@
+import gzip
+import os
+from itertools import islice
+from datetime import datetime, timedelta
+from bson import json_util
+from pymongo import ReplaceOne
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Absolute path on durable storage (a mounted volume), archival is disabled when unset
+POST_ARCHIVE_DIR = os.getenv("POST_ARCHIVE_DIR")
+POST_ARCHIVE_COMPRESSION = os.getenv("POST_ARCHIVE_COMPRESSION", "gzip")
+POST_RETENTION_DAYS = int(os.getenv("POST_RETENTION_DAYS", "90"))
+
+# Records per independently compressed block, bounds both memory and the cost of a lookup
+ARCHIVE_BLOCK_RECORDS = 256
+
+# Fields kept on the slim document left behind in the posts collection
+SLIM_POST_FIELDS = ("posted_at", "status", "account_id", "run_id", "error")
+
+_EXTENSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+# Suffix of the seek index written next to every archive file
+INDEX_SUFFIX = ".idx"
+
+
+def _compressor(compression):
+    if compression == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor(level=6).compress
+    raise Exception(f"Unsupported archive compression: {compression}")
+
+
+def _decompress(path, data):
+    if path.endswith(_EXTENSIONS["zstd"]):
+        if zstandard is None:
+            raise Exception("Reading zstd archives requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _serialize(document):
+    return json_util.dumps(document, json_options=json_util.RELAXED_JSON_OPTIONS).encode() + b"\n"
+
+
+def export_posts(documents, path, compression=POST_ARCHIVE_COMPRESSION, block_records=ARCHIVE_BLOCK_RECORDS):
+    """
+    Stream documents to a compressed NDJSON file, one block at a time.
+
+    Every block of up to block_records lines is compressed on its own (a gzip member
+    or a zstd frame). Concatenated blocks are still a valid .gz/.zst file for standard
+    tools, and a single record can be read back by decompressing only its block.
+
+    The seek index is streamed to path + INDEX_SUFFIX as it is written, one
+    {"_id", "offset", "length"} line per document, so memory stays bounded by one
+    block whatever the number of documents. Read it back with iter_index.
+
+    Parameters:
+    - documents: Iterable of documents, typically a Mongo cursor
+    - path: Archive file to create
+    - compression: "gzip" or "zstd"
+    - block_records: Records per compressed block
+
+    Returns:
+    - Number of exported documents
+    """
+    compress = _compressor(compression)
+    exported = 0
+
+    with open(path, "xb") as f, open(path + INDEX_SUFFIX, "xb") as index:
+        block, block_ids = [], []
+
+        def flush():
+            nonlocal exported
+            data = compress(b"".join(block))
+            offset = f.tell()
+            f.write(data)
+            index.writelines(
+                _serialize({"_id": document_id, "offset": offset, "length": len(data)})
+                for document_id in block_ids
+            )
+            exported += len(block_ids)
+            block.clear()
+            block_ids.clear()
+
+        for document in documents:
+            block.append(_serialize(document))
+            block_ids.append(document["_id"])
+            if len(block) >= block_records:
+                flush()
+        if block:
+            flush()
+
+        for synced in (f, index):
+            synced.flush()
+            os.fsync(synced.fileno())
+
+    return exported
+
+
+def iter_index(path):
+    """
+    Stream the seek index of an archive written by export_posts.
+
+    Parameters:
+    - path: Archive file
+
+    Returns:
+    - Iterator of (document id, block offset, block length), in export order
+    """
+    with open(path + INDEX_SUFFIX, "rb") as index:
+        for line in index:
+            entry = json_util.loads(line)
+            yield entry["_id"], entry["offset"], entry["length"]
+
+
+def read_archived_post(location, post_id):
+    """
+    Read one record back from an archive through its seek index entry.
+
+    Parameters:
+    - location: {"file", "offset", "length"} of the block holding the record
+    - post_id: Id of the record
+
+    Returns:
+    - The full archived document, or None if the block does not contain it
+    """
+    with open(location["file"], "rb") as f:
+        f.seek(location["offset"])
+        block = _decompress(location["file"], f.read(location["length"]))
+
+    needle = str(post_id).encode()
+    for line in block.splitlines():
+        # Only parse the lines that can hold the id
+        if needle not in line:
+            continue
+        document = json_util.loads(line)
+        if document["_id"] == post_id:
+            return document
+    return None
+
+
+def archive_old_posts(posts_collection, older_than_days=POST_RETENTION_DAYS, archive_dir=POST_ARCHIVE_DIR,
+                      compression=POST_ARCHIVE_COMPRESSION, batch_size=1000):
+    """
+    Move posts older than the retention period into a compressed archive file.
+
+    Archived posts are replaced by a slim document holding their status fields and
+    an "archived" seek index entry {file, offset, length}, so counts and lookups by id
+    keep working while the full LinkedIn responses leave the collection.
+
+    Parameters:
+    - posts_collection: Collection of published posts
+    - older_than_days: Retention period, older posts are archived
+    - archive_dir: Absolute directory on durable storage, POST_ARCHIVE_DIR by default
+    - compression: "gzip" or "zstd"
+    - batch_size: Documents slimmed down per bulk write
+
+    Returns:
+    - Summary with the archive file and the number of archived posts
+    """
+    # The full posts are only kept in the file, it must outlive the container
+    if not archive_dir:
+        raise Exception("POST_ARCHIVE_DIR is not set, refusing to archive posts to ephemeral disk")
+    if not os.path.isabs(archive_dir):
+        raise Exception(f"Archive directory must be an absolute path on durable storage: {archive_dir}")
+
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    query = {"posted_at": {"$lt": cutoff}, "archived": {"$exists": False}}
+    if posts_collection.count_documents(query, limit=1) == 0:
+        return {"file": None, "archived": 0}
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"posts-{datetime.now():%Y%m%dT%H%M%S}{_EXTENSIONS[compression]}")
+
+    # The file is written and synced before any document is slimmed down
+    cursor = posts_collection.find(query, batch_size=batch_size).sort("_id", 1)
+    export_posts(cursor, path, compression=compression)
+
+    archived = 0
+    entries = iter_index(path)
+    while True:
+        batch = list(islice(entries, batch_size))
+        if not batch:
+            break
+        originals = {
+            document["_id"]: document
+            for document in posts_collection.find(
+                {"_id": {"$in": [document_id for document_id, _, _ in batch]}},
+                {field: 1 for field in SLIM_POST_FIELDS}
+            )
+        }
+        requests = [
+            ReplaceOne({"_id": document_id, "archived": {"$exists": False}}, {
+                **{field: originals[document_id][field] for field in SLIM_POST_FIELDS if field in originals[document_id]},
+                "archived": {"file": path, "offset": offset, "length": length, "archived_at": datetime.now()}
+            })
+            for document_id, offset, length in batch
+            if document_id in originals
+        ]
+        if requests:
+            archived += posts_collection.bulk_write(requests, ordered=False).modified_count
+
+    print(f"Archived {archived} posts older than {older_than_days} days to {path}")
+    return {"file": path, "archived": archived}
+
+
+def find_post(posts_collection, post_id):
+    """
+    Get a post by id, reading it back from its archive if it was archived.
+
+    When the archive file is gone or no longer holds the post, the slim document
+    is returned instead, with its status fields and the "archived" entry.
+    """
+    post = posts_collection.find_one({"_id": post_id})
+    if post and "archived" in post:
+        try:
+            archived = read_archived_post(post["archived"], post_id)
+        except FileNotFoundError:
+            print(f"Archive file {post['archived']['file']} of post {post_id} is missing")
+            return post
+        return archived or post
+    return post
+
+
+def run_benchmark(posts=50000, path="/tmp/post_archive_benchmark"):
+    """
+    Export synthetic posts with LinkedIn-sized responses in both formats and report
+    throughput, compression ratio, peak memory and random lookup latency.
+    """
+    import random
+    import time
+    import tracemalloc
+    from bson import ObjectId
+
+    def synthetic_posts():
+        for i in range(posts):
+            post_id = ObjectId()
+            yield {
+                "_id": post_id,
+                "posted_at": datetime(2025, 1, 1) + timedelta(hours=i),
+                "status": "success",
+                "response": {
+                    "id": f"urn:li:share:{7000000000000000000 + i}",
+                    "headers": {"x-restli-id": f"urn:li:share:{i}", "content-type": "application/json"},
+                    "text": " ".join(random.choice(["AI", "agents", "LinkedIn", "growth", "teams", "data"]) for _ in range(120))
+                }
+            }
+
+    raw_bytes = sum(len(_serialize(post)) for post in synthetic_posts())
+    for compression in ("gzip", "zstd"):
+        target = path + _EXTENSIONS[compression]
+        for existing in (target, target + INDEX_SUFFIX):
+            if os.path.exists(existing):
+                os.remove(existing)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        export_posts(synthetic_posts(), target, compression=compression)
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        samples = random.sample(list(iter_index(target)), 200)
+        started = time.perf_counter()
+        for post_id, offset, length in samples:
+            assert read_archived_post({"file": target, "offset": offset, "length": length}, post_id)
+        lookup_ms = (time.perf_counter() - started) / len(samples) * 1e3
+
+        print(f"{compression}:")
+        print(f"  export:      {posts / seconds:.0f} posts/s")
+        print(f"  ratio:       {raw_bytes / os.path.getsize(target):.1f}x ({raw_bytes / 1e6:.1f} MB -> {os.path.getsize(target) / 1e6:.1f} MB)")
+        print(f"  peak memory: {peak / 1e6:.1f} MB")
+        print(f"  lookup:      {lookup_ms:.2f} ms per record")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,139 @@
+import re
+from config.llm_config import llm
+
+LINKEDIN_MAX_CHARS = 3000
+MAX_HASHTAGS = 5
+MAX_LIST_ITEMS = 5
+
+HASHTAG_PATTERN = re.compile(r'#\w+')
+LIST_ITEM_PATTERN = re.compile(r'^(•|\d+\.) ')
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s')
+
+
+def linkedin_char_count(text):
+    """
+    Count characters the way LinkedIn does: in UTF-16 code units,
+    so emoji and other astral characters count twice.
+    """
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _split_blocks(text):
+    return [block for block in re.split(r'\n{2,}', text.strip()) if block.strip()]
+
+
+def _join_blocks(blocks):
+    return "\n\n".join(blocks)
+
+
+def _is_hashtag_block(block):
+    return bool(HASHTAG_PATTERN.search(block)) and not HASHTAG_PATTERN.sub('', block).strip()
+
+
+def cap_hashtags(text, max_hashtags=MAX_HASHTAGS):
+    """Deduplicate the trailing hashtag block and keep at most max_hashtags of them"""
+    blocks = _split_blocks(text)
+    if not blocks or not _is_hashtag_block(blocks[-1]):
+        return text
+
+    hashtags = list(dict.fromkeys(HASHTAG_PATTERN.findall(blocks[-1])))[:max_hashtags]
+    return _join_blocks(blocks[:-1] + [" ".join(hashtags)])
+
+
+def compress_lists(text, max_items=MAX_LIST_ITEMS):
+    """Keep at most max_items items per list and cut every item down to its first sentence"""
+    compressed = []
+    list_length = 0
+    for line in text.split("\n"):
+        if not LIST_ITEM_PATTERN.match(line):
+            list_length = 0
+            compressed.append(line)
+            continue
+
+        list_length += 1
+        if list_length > max_items:
+            continue
+        # Split the item text only, the "1." marker itself ends like a sentence
+        marker = LIST_ITEM_PATTERN.match(line).group(0)
+        item = SENTENCE_END_PATTERN.split(line[len(marker):], maxsplit=1)[0]
+        compressed.append(marker + item)
+
+    return "\n".join(compressed)
+
+
+def drop_trailing_sections(text, limit=LINKEDIN_MAX_CHARS):
+    """
+    Drop body sections from the end until the post fits, always keeping
+    the opening hook, the closing call to action and the hashtags.
+    """
+    blocks = _split_blocks(text)
+    hashtags = [blocks.pop()] if blocks and _is_hashtag_block(blocks[-1]) else []
+
+    while len(blocks) > 2 and linkedin_char_count(_join_blocks(blocks + hashtags)) > limit:
+        blocks.pop(-2)
+
+    return _join_blocks(blocks + hashtags)
+
+
+def shrink_post(text, limit=LINKEDIN_MAX_CHARS):
+    """
+    Deterministically shrink a LinkedIn-formatted post, applying the
+    least destructive step first and stopping as soon as it fits.
+    """
+    for step in (cap_hashtags, compress_lists):
+        if linkedin_char_count(text) <= limit:
+            return text
+        text = step(text)
+
+    if linkedin_char_count(text) <= limit:
+        return text
+    return drop_trailing_sections(text, limit)
+
+
+def shorten_with_llm(text, limit=LINKEDIN_MAX_CHARS):
+    """Ask the LLM to shorten the existing post text, rather than regenerating it"""
+    # Aim below the limit, models are not precise at counting characters
+    target = int(limit * 0.9)
+    return llm.call([
+        {
+            "role": "system",
+            "content": "You shorten LinkedIn posts. Return only the shortened post, with no commentary."
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Shorten this LinkedIn post to at most {target} characters. "
+                "Keep the headline, the key insights, the call to action and the hashtags, "
+                "and keep the existing formatting style.\n\n"
+                f"{text}"
+            )
+        }
+    ]).strip()
+
+
+def enforce_length(text, limit=LINKEDIN_MAX_CHARS):
+    """
+    Make sure a LinkedIn-formatted post fits under LinkedIn's character limit.
+
+    Parameters:
+    - text: Post text as returned by convert_md_to_linkedin_format
+    - limit: Maximum number of characters allowed
+
+    Returns:
+    - The post text, shrunk locally or through a single LLM call if needed
+    """
+    if linkedin_char_count(text) <= limit:
+        return text
+
+    original_length = linkedin_char_count(text)
+    text = shrink_post(text, limit)
+    if linkedin_char_count(text) <= limit:
+        print(f"Post shrunk locally from {original_length} to {linkedin_char_count(text)} characters")
+        return text
+
+    text = shrink_post(shorten_with_llm(text, limit), limit)
+    if linkedin_char_count(text) > limit:
+        raise Exception(f"Post is {linkedin_char_count(text)} characters, over LinkedIn's limit of {limit}")
+
+    print(f"Post shortened by the LLM from {original_length} to {linkedin_char_count(text)} characters")
+    return text
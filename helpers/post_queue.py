@@ -0,0 +1,150 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, ReturnDocument
+
+POST_QUEUE_LEASE_SECONDS = int(os.getenv("POST_QUEUE_LEASE_SECONDS", "300"))
+POST_QUEUE_MAX_ATTEMPTS = int(os.getenv("POST_QUEUE_MAX_ATTEMPTS", "3"))
+
+
+class PostQueue:
+    """
+    Work queue of scheduled posts backed by a Mongo collection.
+
+    A worker claims the oldest visible queued post with one atomic find_one_and_update,
+    which also takes a lease on it. A claim whose lease expires becomes visible again,
+    and a post that was attempted max_attempts times moves to the "dead" state instead.
+
+    States: queued -> claimed -> done, or back to queued on failure / lease expiry,
+    or dead after max_attempts.
+    """
+
+    def __init__(self, collection, lease_seconds=POST_QUEUE_LEASE_SECONDS, max_attempts=POST_QUEUE_MAX_ATTEMPTS):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Sweep expired leases at most this often rather than on every claim
+        self.sweep_interval = min(5, lease_seconds)
+        self._next_sweep = datetime.min
+
+    def ensure_indexes(self):
+        """Indexes backing the claim query and the expired lease sweep"""
+        self.collection.create_index(
+            [("status", ASCENDING), ("available_at", ASCENDING), ("created_at", ASCENDING)],
+            name="claim"
+        )
+        self.collection.create_index(
+            [("lease_expires_at", ASCENDING)],
+            name="claimed_lease",
+            partialFilterExpression={"status": "claimed"}
+        )
+
+    def enqueue(self, content, available_at=None, **fields):
+        """
+        Add a post to the queue.
+
+        Parameters:
+        - content: Text of the post
+        - available_at: Optional - datetime before which the post cannot be claimed
+        - fields: Extra fields stored on the queue document
+
+        Returns:
+        - Id of the queued post
+        """
+        now = datetime.now()
+        return self.collection.insert_one({
+            **fields,
+            "content": content,
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+            "available_at": available_at or now
+        }).inserted_id
+
+    def release_expired(self, now=None):
+        """Requeue, or dead-letter, claims whose worker let the lease expire"""
+        now = now or datetime.now()
+        expired = {"status": "claimed", "lease_expires_at": {"$lte": now}}
+        dead = self.collection.update_many(
+            {**expired, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {"status": "dead", "last_error": "Lease expired", "dead_at": now},
+             "$unset": {"lease_expires_at": "", "worker_id": ""}}
+        ).modified_count
+        requeued = self.collection.update_many(
+            expired,
+            {"$set": {"status": "queued", "available_at": now, "last_error": "Lease expired"},
+             "$unset": {"lease_expires_at": "", "worker_id": ""}}
+        ).modified_count
+        return requeued, dead
+
+    def claim(self, worker_id=None):
+        """
+        Atomically claim the oldest visible queued post.
+
+        Returns:
+        - The claimed document, with its "worker_id" to use as the lease token, or None
+        """
+        now = datetime.now()
+        if now >= self._next_sweep:
+            self._next_sweep = now + timedelta(seconds=self.sweep_interval)
+            self.release_expired(now)
+        return self.collection.find_one_and_update(
+            {"status": "queued", "available_at": {"$lte": now}},
+            {
+                "$set": {
+                    "status": "claimed",
+                    "worker_id": worker_id or str(uuid.uuid4()),
+                    "claimed_at": now,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds)
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", ASCENDING), ("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def extend_lease(self, post):
+        """Keep a long-running claim alive. Returns False if the lease was lost"""
+        return self.collection.update_one(
+            {"_id": post["_id"], "status": "claimed", "worker_id": post["worker_id"]},
+            {"$set": {"lease_expires_at": datetime.now() + timedelta(seconds=self.lease_seconds)}}
+        ).modified_count == 1
+
+    def complete(self, post, **fields):
+        """Mark a claimed post as done. Returns False if the lease was lost to another worker"""
+        return self.collection.update_one(
+            {"_id": post["_id"], "status": "claimed", "worker_id": post["worker_id"]},
+            {"$set": {**fields, "status": "done", "completed_at": datetime.now()},
+             "$unset": {"lease_expires_at": ""}}
+        ).modified_count == 1
+
+    def fail(self, post, error, retry_delay=60):
+        """
+        Release a claimed post after a failed attempt: requeue it after a backoff,
+        or dead-letter it once it reached max_attempts.
+
+        Returns:
+        - The new state, "queued" or "dead", or None if the lease was already lost
+        """
+        now = datetime.now()
+        if post["attempts"] >= self.max_attempts:
+            state = {"status": "dead", "dead_at": now}
+        else:
+            state = {"status": "queued", "available_at": now + timedelta(seconds=retry_delay * 2 ** (post["attempts"] - 1))}
+
+        updated = self.collection.update_one(
+            {"_id": post["_id"], "status": "claimed", "worker_id": post["worker_id"]},
+            {"$set": {**state, "last_error": str(error)},
+             "$unset": {"lease_expires_at": "", "worker_id": ""}}
+        ).modified_count
+        return state["status"] if updated else None
+
+    def stats(self):
+        """Number of queue documents per state"""
+        return {
+            row["_id"]: row["count"]
+            for row in self.collection.aggregate([
+                {"$match": {"status": {"$in": ["queued", "claimed", "done", "dead"]}}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ])
+        }
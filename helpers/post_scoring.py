@@ -0,0 +1,138 @@
+import re
+from helpers.post_length import linkedin_char_count, HASHTAG_PATTERN, LINKEDIN_MAX_CHARS
+
+# Posts in this band read fully on mobile without feeling thin
+IDEAL_MIN_CHARS = 1200
+IDEAL_MAX_CHARS = 2000
+
+# LinkedIn cuts the preview after roughly this many characters ("...see more")
+HOOK_PREVIEW_CHARS = 140
+IDEAL_HASHTAGS = (3, 5)
+
+SCORE_WEIGHTS = {"length": 0.3, "hook": 0.3, "hashtags": 0.15, "readability": 0.25}
+
+WEAK_HOOK_OPENERS = (
+    "in today's", "in the ever", "in this post", "as we all know", "have you ever wondered",
+    "i'm excited to share", "i am excited to share", "let's talk about", "hello",
+)
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]+[.!?]?')
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]*")
+VOWEL_GROUP_PATTERN = re.compile(r'[aeiouy]+')
+MARKDOWN_PATTERN = re.compile(r'[*_#>`]+')
+
+
+def _syllables(word):
+    word = word.lower()
+    count = len(VOWEL_GROUP_PATTERN.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and count > 1:
+        count -= 1
+    return max(count, 1)
+
+
+def score_length(text):
+    """1 inside the ideal band, falling linearly to 0 at no text or at the LinkedIn limit"""
+    chars = linkedin_char_count(text)
+    if chars > LINKEDIN_MAX_CHARS:
+        return 0.0
+    if chars < IDEAL_MIN_CHARS:
+        return chars / IDEAL_MIN_CHARS
+    if chars > IDEAL_MAX_CHARS:
+        return 1 - (chars - IDEAL_MAX_CHARS) / (LINKEDIN_MAX_CHARS - IDEAL_MAX_CHARS)
+    return 1.0
+
+
+def hook_line(text):
+    """First non-empty line of the post, without markdown markers"""
+    for line in text.strip().split("\n"):
+        line = MARKDOWN_PATTERN.sub("", line).strip()
+        if line:
+            return line
+    return ""
+
+
+def score_hook(text):
+    """
+    Strength of the opening line: it must fit in the preview, and it gains from
+    specifics (numbers), curiosity (questions) and direct address, while generic
+    openers lose points.
+    """
+    hook = hook_line(text)
+    if not hook:
+        return 0.0
+
+    score = 0.4 if len(hook) <= HOOK_PREVIEW_CHARS else 0.1
+    lowered = hook.lower()
+    if re.search(r'\d', hook):
+        score += 0.2
+    if hook.endswith("?") or hook.endswith("!"):
+        score += 0.15
+    if re.search(r'\byou(r)?\b', lowered):
+        score += 0.15
+    if len(hook.split()) <= 12:
+        score += 0.1
+    if lowered.startswith(WEAK_HOOK_OPENERS):
+        score -= 0.4
+    return min(max(score, 0.0), 1.0)
+
+
+def score_hashtags(text):
+    """1 for 3 to 5 distinct hashtags, less for fewer or more"""
+    count = len(set(HASHTAG_PATTERN.findall(text)))
+    low, high = IDEAL_HASHTAGS
+    if low <= count <= high:
+        return 1.0
+    if count < low:
+        return count / low
+    return max(0.0, 1 - (count - high) * 0.2)
+
+
+def reading_ease(text):
+    """Flesch reading ease of the post, higher is easier (60-70 is plain English)"""
+    sentences = [s for s in SENTENCE_PATTERN.findall(HASHTAG_PATTERN.sub("", text)) if WORD_PATTERN.search(s)]
+    words = WORD_PATTERN.findall(text)
+    if not sentences or not words:
+        return 0.0
+    syllables = sum(_syllables(word) for word in words)
+    return 206.835 - 1.015 * len(words) / len(sentences) - 84.6 * syllables / len(words)
+
+
+def score_readability(text):
+    """1 for reading ease of 50 or more, falling to 0 at 10, minus a penalty for walls of text"""
+    score = min(max((reading_ease(text) - 10) / 40, 0.0), 1.0)
+    paragraphs = [p for p in re.split(r'\n{2,}', text.strip()) if p.strip()]
+    if paragraphs and max(linkedin_char_count(p) for p in paragraphs) > 600:
+        score *= 0.7
+    return score
+
+
+def score_post(text):
+    """
+    Score a post with fast local heuristics, no LLM call involved.
+
+    Returns:
+    - Dict with the weighted "score" between 0 and 1 and the score of every criterion
+    """
+    scores = {
+        "length": score_length(text),
+        "hook": score_hook(text),
+        "hashtags": score_hashtags(text),
+        "readability": score_readability(text),
+    }
+    scores = {name: round(value, 3) for name, value in scores.items()}
+    scores["score"] = round(sum(SCORE_WEIGHTS[name] * value for name, value in scores.items()), 3)
+    return scores
+
+
+def rank_posts(posts, text=None):
+    """
+    Sort posts from best to worst.
+
+    Parameters:
+    - posts: Posts to rank
+    - text: Optional - function giving the text to score for a post, e.g. its LinkedIn formatting
+
+    Returns:
+    - List of (post, scores) pairs, best first
+    """
+    scored = [(post, score_post(text(post) if text else post)) for post in posts]
+    return sorted(scored, key=lambda pair: pair[1]["score"], reverse=True)
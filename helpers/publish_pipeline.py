@@ -0,0 +1,153 @@
+import time
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from helpers.tracing import trace_run, trace_span, current_token_usage
+
+RUN_LEASE_SECONDS = 15 * 60
+
+
+class RunInProgressError(Exception):
+    """Raised when another worker currently holds the lease on a run"""
+
+
+def _claim_run(runs_collection, idempotency_key):
+    """Create the run document if needed and take its lease, unless it is finished or leased"""
+    now = datetime.now()
+    try:
+        return runs_collection.find_one_and_update(
+            {
+                "_id": idempotency_key,
+                "status": {"$ne": "completed"},
+                "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lt": now}}]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_expires_at": now + timedelta(seconds=RUN_LEASE_SECONDS),
+                    "updated_at": now
+                },
+                "$setOnInsert": {"created_at": now, "stages": {}, "started_stages": {}},
+                "$inc": {"attempts": 1}
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # The run exists but did not match: it is either completed or leased by someone else
+        run = runs_collection.find_one({"_id": idempotency_key})
+        if run and run.get("status") == "completed":
+            return run
+        raise RunInProgressError(f"Run {idempotency_key} is already in progress")
+
+
+def run_pipeline(runs_collection, idempotency_key, stages):
+    """
+    Run publish stages in order, checkpointing each stage's output to a run document.
+
+    A run that is retried with the same idempotency key resumes after its last
+    completed stage, and a completed run is returned as is without doing any work.
+
+    Parameters:
+    - runs_collection: Mongo collection holding one run document per idempotency key
+    - idempotency_key: Key identifying the run, e.g. the scheduled fire time or a draft id
+    - stages: List of (name, stage) or (name, stage, reconcile) tuples. stage(outputs)
+      receives the outputs of the completed stages and returns a BSON-serializable value.
+      reconcile(outputs) is called instead of re-running a stage that was started but
+      never checkpointed; it returns the output if the side effect already happened, else None.
+
+    Returns:
+    - The run document, with stage outputs under "stages", the duration of every
+      stage in seconds under "stage_seconds" and crew token counts under "token_usage"
+    """
+    # Every span of the run, down to the LinkedIn API calls, carries the idempotency key as run id
+    with trace_run(idempotency_key):
+        return _run_stages(runs_collection, idempotency_key, stages)
+
+
+def _run_stages(runs_collection, idempotency_key, stages):
+    run = _claim_run(runs_collection, idempotency_key)
+    if run.get("status") == "completed":
+        print(f"Run {idempotency_key} already completed, skipping")
+        return run
+
+    outputs = dict(run.get("stages", {}))
+    started_stages = run.get("started_stages", {})
+
+    for name, stage, *reconcile in stages:
+        if name in outputs:
+            continue
+
+        output = None
+        started = time.monotonic()
+        usage_before = current_token_usage()
+        if name in started_stages and reconcile:
+            # The stage may have had its side effect even though its output was lost
+            output = reconcile[0](outputs)
+            if output is not None:
+                print(f"Run {idempotency_key}: recovered output of stage '{name}'")
+
+        if output is None:
+            runs_collection.update_one(
+                {"_id": idempotency_key},
+                {"$set": {f"started_stages.{name}": datetime.now(), "current_stage": name}}
+            )
+            try:
+                with trace_span(f"stage {name}", kind="stage"):
+                    output = stage(outputs)
+            except Exception as e:
+                runs_collection.update_one(
+                    {"_id": idempotency_key},
+                    {"$set": {
+                        "status": "failed",
+                        "failed_stage": name,
+                        "last_error": str(e),
+                        "lease_expires_at": None,
+                        "updated_at": datetime.now()
+                    }}
+                )
+                raise
+
+        outputs[name] = output
+        update = {"$set": {
+            f"stages.{name}": output,
+            f"stage_seconds.{name}": round(time.monotonic() - started, 3),
+            "updated_at": datetime.now()
+        }}
+        usage = {
+            f"token_usage.{key}": value - usage_before.get(key, 0)
+            for key, value in current_token_usage().items()
+            if value != usage_before.get(key, 0)
+        }
+        if usage:
+            update["$inc"] = usage
+        runs_collection.update_one({"_id": idempotency_key}, update)
+
+    return runs_collection.find_one_and_update(
+        {"_id": idempotency_key},
+        {"$set": {
+            "status": "completed",
+            "completed_at": datetime.now(),
+            "lease_expires_at": None,
+            "updated_at": datetime.now()
+        }, "$unset": {"current_stage": "", "failed_stage": ""}},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def run_pipeline_with_retries(runs_collection, idempotency_key, stages, max_attempts=3, base_delay=30):
+    """
+    Run a pipeline, retrying failed runs with exponential backoff.
+    Every retry resumes from the last completed stage.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return run_pipeline(runs_collection, idempotency_key, stages)
+        except RunInProgressError:
+            raise
+        except Exception as e:
+            if attempt == max_attempts - 1:
+                raise
+            delay = base_delay * 2 ** attempt
+            print(f"Run {idempotency_key} failed ({e}), retrying in {delay}s")
+            time.sleep(delay)
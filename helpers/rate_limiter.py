@@ -0,0 +1,160 @@
+import hashlib
+import os
+import threading
+import time
+from pymongo.errors import DuplicateKeyError
+
+DAY = 24 * 60 * 60
+
+# Token buckets per LinkedIn endpoint as (burst capacity, tokens refilled per second).
+# "member" buckets are kept per access token, "app" buckets are shared by every token.
+LINKEDIN_RATE_LIMITS = {
+    "assets": {"member": (5, 150 / DAY), "app": (50, 100000 / DAY)},
+    "upload": {"member": (5, 150 / DAY), "app": (50, 100000 / DAY)},
+    "ugcPosts": {"member": (5, 150 / DAY), "app": (50, 100000 / DAY)},
+}
+
+
+class RateLimitExceeded(Exception):
+    """Raised in fail-fast mode, or when a blocking wait would exceed its timeout"""
+
+    def __init__(self, key, retry_after):
+        super().__init__(f"Rate limit exceeded for {key}, retry after {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class MemoryBucketBackend:
+    """Token buckets kept in process memory, shared by all threads of the process"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, now):
+        """
+        Refill the bucket and take one token from it if available.
+
+        Returns:
+        - 0 if a token was taken, otherwise the seconds until one becomes available
+        """
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - updated_at) * refill_rate)
+            updated_at = max(now, updated_at)
+            if tokens < 1:
+                self._buckets[key] = (tokens, updated_at)
+                return (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens - 1, updated_at)
+            return 0
+
+    def refund(self, key, capacity):
+        """Give back a token taken for a call that was not made"""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + 1), updated_at)
+
+
+class MongoBucketBackend:
+    """
+    Token buckets stored in a Mongo collection so every process and worker shares them.
+    Updates use compare-and-set on the previous bucket state, retrying on contention.
+    """
+
+    def __init__(self, collection, max_retries=20):
+        self.collection = collection
+        self.max_retries = max_retries
+
+    def take(self, key, capacity, refill_rate, now):
+        """Same contract as MemoryBucketBackend.take"""
+        for _ in range(self.max_retries):
+            bucket = self.collection.find_one({"_id": key})
+            if bucket is None:
+                try:
+                    self.collection.insert_one({"_id": key, "tokens": capacity - 1, "updated_at": now})
+                    return 0
+                except DuplicateKeyError:
+                    continue
+
+            tokens = min(capacity, bucket["tokens"] + max(0, now - bucket["updated_at"]) * refill_rate)
+            if tokens < 1:
+                return (1 - tokens) / refill_rate
+
+            result = self.collection.update_one(
+                {"_id": key, "tokens": bucket["tokens"], "updated_at": bucket["updated_at"]},
+                {"$set": {"tokens": tokens - 1, "updated_at": max(now, bucket["updated_at"])}}
+            )
+            if result.modified_count:
+                return 0
+
+        raise RateLimitExceeded(key, 0)
+
+    def refund(self, key, capacity):
+        """Same contract as MemoryBucketBackend.refund"""
+        self.collection.update_one({"_id": key, "tokens": {"$lte": capacity - 1}}, {"$inc": {"tokens": 1}})
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with one bucket per endpoint for the whole app
+    and one per endpoint and access token.
+    """
+
+    def __init__(self, backend=None, limits=None, block=True, max_wait=300, clock=time.time, sleep=time.sleep):
+        self.backend = backend or MemoryBucketBackend()
+        self.limits = limits or LINKEDIN_RATE_LIMITS
+        self.block = block
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+
+    def _buckets(self, endpoint, token):
+        limits = self.limits[endpoint]
+        # Never store the access token itself in bucket keys
+        token_id = hashlib.sha256((token or "").encode()).hexdigest()[:16]
+        return [
+            (f"member:{endpoint}:{token_id}", *limits["member"]),
+            (f"app:{endpoint}", *limits["app"]),
+        ]
+
+    def acquire(self, endpoint, token, block=None, timeout=None):
+        """
+        Take a token from every bucket guarding a call to the endpoint.
+
+        Parameters:
+        - endpoint: Key in the limits table, e.g. "ugcPosts"
+        - token: Access token the call is made with
+        - block: Wait for tokens (True) or raise RateLimitExceeded right away (False)
+        - timeout: Maximum seconds to wait in blocking mode
+
+        Returns:
+        - Seconds spent waiting
+        """
+        block = self.block if block is None else block
+        timeout = self.max_wait if timeout is None else timeout
+        waited = 0
+        taken = []
+
+        try:
+            for key, capacity, refill_rate in self._buckets(endpoint, token):
+                while True:
+                    retry_after = self.backend.take(key, capacity, refill_rate, self.clock())
+                    if not retry_after:
+                        taken.append((key, capacity))
+                        break
+                    if not block or waited + retry_after > timeout:
+                        raise RateLimitExceeded(key, retry_after)
+                    self.sleep(retry_after)
+                    waited += retry_after
+        except RateLimitExceeded:
+            # The call is not made, so the tokens already taken for it go back
+            for key, capacity in taken:
+                self.backend.refund(key, capacity)
+            raise
+
+        return waited
+
+
+linkedin_rate_limiter = RateLimiter(block=os.getenv("LINKEDIN_RATE_LIMIT_MODE", "block") != "fail")
+
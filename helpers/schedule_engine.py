@@ -0,0 +1,245 @@
+import heapq
+import sys
+import threading
+from datetime import datetime
+import pytz
+from helpers.schedules import DEFAULT_SCHEDULE, next_fire_time
+
+
+class ScheduleEntry:
+    """Compact in-memory posting schedule of one account"""
+
+    __slots__ = ("account_id", "days", "hour", "minute", "timezone", "next_fire")
+
+    def __init__(self, account_id, schedule, next_fire):
+        self.account_id = account_id
+        # Weekdays as a 7-bit mask, Monday is bit 0
+        self.days = sum(1 << day for day in schedule["days"])
+        self.hour = schedule["hour"]
+        self.minute = schedule["minute"]
+        # Interned so all entries in the same timezone share one string
+        self.timezone = sys.intern(schedule.get("timezone", "UTC"))
+        # Next fire time as a UTC timestamp
+        self.next_fire = next_fire
+
+    def schedule(self):
+        return {
+            "days": [day for day in range(7) if self.days >> day & 1],
+            "hour": self.hour,
+            "minute": self.minute,
+            "timezone": self.timezone
+        }
+
+    def matches(self, schedule):
+        """True if the entry was built from the same weekly schedule"""
+        return (
+            self.days == sum(1 << day for day in schedule["days"])
+            and self.hour == schedule["hour"]
+            and self.minute == schedule["minute"]
+            and self.timezone == schedule.get("timezone", "UTC")
+        )
+
+    def advance(self):
+        """Move next_fire to the fire time following the current one"""
+        after = datetime.fromtimestamp(self.next_fire, pytz.utc)
+        self.next_fire = next_fire_time(self.schedule(), after).timestamp()
+
+
+class ScheduleEngine:
+    """
+    In-process scheduler for many per-account schedules.
+
+    Entries sit in a min-heap keyed by their precomputed next fire time, so finding the
+    next fire is O(1), and firing or rescheduling an entry is O(log n). Removed or
+    replaced entries are dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._watermark = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def upsert(self, account_id, schedule, next_fire=None):
+        """
+        Add or replace the schedule of an account.
+
+        Parameters:
+        - account_id: Id of the account
+        - schedule: Weekly schedule, see helpers.schedules.DEFAULT_SCHEDULE
+        - next_fire: Optional - UTC datetime of the next fire, computed from now when None
+        """
+        next_fire = next_fire or next_fire_time(schedule, datetime.now(pytz.utc))
+        if next_fire.tzinfo is None:
+            # Mongo returns naive UTC datetimes
+            next_fire = next_fire.replace(tzinfo=pytz.utc)
+
+        entry = ScheduleEntry(account_id, schedule, next_fire.timestamp())
+        with self._lock:
+            self._entries[account_id] = entry
+            heapq.heappush(self._heap, (entry.next_fire, id(entry), entry))
+
+    def remove(self, account_id):
+        """Stop scheduling an account"""
+        with self._lock:
+            self._entries.pop(account_id, None)
+
+    def _drop_stale(self):
+        while self._heap:
+            next_fire, _, entry = self._heap[0]
+            if self._entries.get(entry.account_id) is entry and entry.next_fire == next_fire:
+                return
+            heapq.heappop(self._heap)
+
+    def peek(self):
+        """
+        Get the next scheduled fire.
+
+        Returns:
+        - (fire time as UTC datetime, account id), or None if nothing is scheduled
+        """
+        with self._lock:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            next_fire, _, entry = self._heap[0]
+            return datetime.fromtimestamp(next_fire, pytz.utc), entry.account_id
+
+    def pop_due(self, now):
+        """
+        Fire every entry that is due at or before now and reschedule it after now.
+
+        Returns:
+        - List of (account id, UTC datetime the entry was due)
+        """
+        now = now.timestamp()
+        due = []
+        with self._lock:
+            while True:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    return due
+                next_fire, _, entry = heapq.heappop(self._heap)
+                due.append((entry.account_id, datetime.fromtimestamp(next_fire, pytz.utc)))
+                # Fire once per call, even when several fires were missed
+                while entry.next_fire <= now:
+                    entry.advance()
+                heapq.heappush(self._heap, (entry.next_fire, id(entry), entry))
+
+    @staticmethod
+    def _moved_on(entry, next_run_at):
+        """True if the stored next fire is later than the entry's in-memory one"""
+        if next_run_at is None:
+            return False
+        if next_run_at.tzinfo is None:
+            next_run_at = next_run_at.replace(tzinfo=pytz.utc)
+        return next_run_at.timestamp() > entry.next_fire
+
+    def reload(self, accounts_collection):
+        """
+        Load accounts changed since the previous reload, or all of them the first time.
+        Accounts must carry an updated_at field that is bumped when their schedule changes.
+
+        The watermark is inclusive, so accounts written in the same instant as the last
+        one seen are not missed, and that last account is read again on every reload.
+        An account already scheduled with the same schedule keeps its in-memory next
+        fire: the stored next_run_at only moves once a publish finishes, so reloading it
+        while the publish runs would schedule the fire that was just popped again.
+        A stored next_run_at later than the in-memory fire is taken, so engines that
+        never pop, e.g. one only answering "when is the next post", follow the fires.
+
+        Returns:
+        - Number of accounts loaded
+        """
+        query = {} if self._watermark is None else {"updated_at": {"$gte": self._watermark}}
+        projection = {"schedule": 1, "active": 1, "next_run_at": 1, "updated_at": 1}
+
+        loaded = 0
+        for account in accounts_collection.find(query, projection):
+            loaded += 1
+            if account.get("updated_at") and (self._watermark is None or account["updated_at"] > self._watermark):
+                self._watermark = account["updated_at"]
+            if not account.get("active"):
+                self.remove(account["_id"])
+                continue
+            schedule = account.get("schedule") or DEFAULT_SCHEDULE
+            with self._lock:
+                entry = self._entries.get(account["_id"])
+            next_run_at = account.get("next_run_at")
+            if entry and entry.matches(schedule) and not self._moved_on(entry, next_run_at):
+                continue
+            self.upsert(account["_id"], schedule, next_run_at)
+
+        if self._watermark is None:
+            # Empty collection: only pick up accounts written from now on
+            self._watermark = datetime.now()
+        return loaded
+
+
+def run_benchmark(schedules=100000):
+    """
+    Measure memory per schedule and the cost of peeking and firing on a synthetic
+    population of schedules spread over several timezones and cadences.
+    """
+    import random
+    import time
+    import tracemalloc
+
+    timezones = ["UTC", "Europe/London", "Europe/Berlin", "America/New_York", "Asia/Tokyo", "Australia/Sydney"]
+    cadences = [[0, 2, 4], [1, 3], [0, 1, 2, 3, 4], [5]]
+    random.seed(42)
+    start = datetime(2026, 1, 5, tzinfo=pytz.utc)
+
+    population = []
+    for account_id in range(schedules):
+        schedule = {
+            "days": random.choice(cadences),
+            "hour": random.randrange(6, 20),
+            "minute": random.choice([0, 15, 30, 45]),
+            "timezone": random.choice(timezones)
+        }
+        population.append((account_id, schedule, next_fire_time(schedule, start)))
+
+    engine = ScheduleEngine()
+    started = time.perf_counter()
+    for account_id, schedule, next_fire in population:
+        engine.upsert(account_id, schedule, next_fire)
+    load_seconds = time.perf_counter() - started
+
+    # Measure memory separately, tracing slows the load down considerably
+    engine = ScheduleEngine()
+    tracemalloc.start()
+    for account_id, schedule, next_fire in population:
+        engine.upsert(account_id, schedule, next_fire)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        engine.peek()
+    peek_micros = (time.perf_counter() - started) / 10000 * 1e6
+
+    # Fire one simulated week in one-minute ticks
+    fired = 0
+    tick_seconds = 0.0
+    ticks = 7 * 24 * 60
+    for minute in range(ticks):
+        now = datetime.fromtimestamp(start.timestamp() + minute * 60, pytz.utc)
+        started = time.perf_counter()
+        fired += len(engine.pop_due(now))
+        tick_seconds += time.perf_counter() - started
+
+    print(f"schedules:            {schedules}")
+    print(f"load time:            {load_seconds:.2f}s")
+    print(f"memory per schedule:  {memory / schedules:.0f} bytes (entry, heap slot and index)")
+    print(f"peek:                 {peek_micros:.2f} us")
+    print(f"fired in one week:    {fired}")
+    print(f"mean tick:            {tick_seconds / ticks * 1e3:.3f} ms")
+    print(f"cost per fired entry: {tick_seconds / max(fired, 1) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+import pytz
+
+# Mon, Wed and Fri at 9:00 AM, the cadence of the original single-account job
+DEFAULT_SCHEDULE = {
+    "days": [0, 2, 4],
+    "hour": 9,
+    "minute": 0,
+    "timezone": "UTC"
+}
+
+
+def next_wall_clock_fire_time(days, hour, minute, after):
+    """
+    Calculate the next wall-clock time on one of the given weekdays (0=Mon) at hour:minute.
+    Works on naive datetimes; the result is strictly later than after.
+    """
+    for days_ahead in range(8):
+        day = after.date() + timedelta(days=days_ahead)
+        if day.weekday() not in days:
+            continue
+        fire_time = datetime(day.year, day.month, day.day, hour, minute)
+        if fire_time > after:
+            return fire_time
+
+    raise ValueError(f"Schedule has no posting days: {days}")
+
+
+def next_fire_time(schedule, after):
+    """
+    Calculate the next time a weekly posting schedule fires.
+
+    Parameters:
+    - schedule: Dictionary with "days" (0=Mon), "hour", "minute" and "timezone"
+    - after: Timezone-aware datetime, the result is strictly later than it
+
+    Returns:
+    - The next fire time as a UTC datetime
+    """
+    tz = pytz.timezone(schedule.get("timezone", "UTC"))
+    local_after = after.astimezone(tz).replace(tzinfo=None)
+    fire_time = next_wall_clock_fire_time(schedule["days"], schedule["hour"], schedule["minute"], local_after)
+    return tz.localize(fire_time).astimezone(pytz.utc)
+
+
+def calculate_next_post_time(now: datetime) -> datetime:
+    """Calculate the next posting time (Mon, Wed, or Fri at 9:00 AM)"""
+    return next_wall_clock_fire_time(
+        DEFAULT_SCHEDULE["days"], DEFAULT_SCHEDULE["hour"], DEFAULT_SCHEDULE["minute"], now
+    )
@@ -0,0 +1,324 @@
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+import litellm
+import requests
+from crewai.agents.parser import AgentFinish
+from crewai.utilities.events import (
+    crewai_event_bus,
+    LLMCallStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    ToolUsageStartedEvent,
+    ToolUsageFinishedEvent,
+    ToolUsageErrorEvent,
+)
+
+# Select with TRACE_EXPORTER=jsonl or TRACE_EXPORTER=otlp, tracing is off otherwise
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+SERVICE_NAME = "linkedin-ai-post"
+
+_run = ContextVar("trace_run", default=None)
+_current_span = ContextVar("trace_current_span", default=None)
+
+
+class JsonLinesExporter:
+    """Append every finished span as one JSON line to a local file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span, default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class OtlpHttpExporter:
+    """Send spans in batches to an OTLP/HTTP JSON collector from a background thread"""
+
+    def __init__(self, endpoint, batch_size=50, flush_interval=5):
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._spans = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def export(self, span):
+        self._spans.put(span)
+
+    def _worker(self):
+        while True:
+            batch = [self._spans.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size and time.time() < deadline:
+                try:
+                    batch.append(self._spans.get(timeout=max(0, deadline - time.time())))
+                except queue.Empty:
+                    break
+            try:
+                requests.post(self.endpoint, json=self._payload(batch), timeout=10)
+            except Exception as e:
+                print(f"Error exporting {len(batch)} spans: {e}")
+
+    @staticmethod
+    def _attribute(key, value):
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _payload(self, spans):
+        return {"resourceSpans": [{
+            "resource": {"attributes": [self._attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": SERVICE_NAME},
+                "spans": [{
+                    "traceId": span["trace_id"],
+                    "spanId": span["span_id"],
+                    "parentSpanId": span["parent_id"] or "",
+                    "name": span["name"],
+                    "kind": 1,
+                    "startTimeUnixNano": str(int(span["start"] * 1e9)),
+                    "endTimeUnixNano": str(int(span["end"] * 1e9)),
+                    "attributes": [
+                        self._attribute(key, value)
+                        for key, value in {"kind": span["kind"], "run_id": span["run_id"], **span["attributes"]}.items()
+                        if value is not None
+                    ],
+                    "status": {"code": 2 if span["status"] == "error" else 1},
+                } for span in spans]
+            }]
+        }]}
+
+
+def _build_exporter():
+    if TRACE_EXPORTER == "jsonl":
+        return JsonLinesExporter(TRACE_FILE)
+    if TRACE_EXPORTER == "otlp":
+        return OtlpHttpExporter(OTLP_ENDPOINT)
+    return None
+
+
+exporter = _build_exporter()
+
+
+def current_run_id():
+    """Id of the run the current code executes under, if any"""
+    run = _run.get()
+    return run["run_id"] if run else None
+
+
+def _open_span(name, kind, attributes, parent=None):
+    parent = parent or _current_span.get()
+    run = _run.get()
+    span = {
+        "trace_id": parent["trace_id"] if parent else (run["trace_id"] if run else uuid.uuid4().hex),
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "run_id": run["run_id"] if run else None,
+        "name": name,
+        "kind": kind,
+        "start": time.time(),
+        "status": "ok",
+        "attributes": attributes,
+    }
+    _current_span.set(span)
+    return span, parent
+
+
+def _close_span(span, parent, status="ok"):
+    span["end"] = time.time()
+    span["duration_ms"] = round((span["end"] - span["start"]) * 1000, 3)
+    span["status"] = status
+    _current_span.set(parent)
+    if exporter:
+        exporter.export({key: value for key, value in span.items() if not key.startswith("_")})
+
+
+@contextmanager
+def trace_run(run_id):
+    """
+    Trace everything executed inside the block under one run id,
+    e.g. the idempotency key of a publish pipeline run.
+    """
+    token = _run.set({"run_id": run_id, "trace_id": uuid.uuid4().hex, "token_usage": {}})
+    try:
+        with trace_span("run", kind="run") as span:
+            yield span
+    finally:
+        _run.reset(token)
+
+
+@contextmanager
+def trace_span(name, kind="internal", **attributes):
+    """Open a span nested under the current one for the duration of the block"""
+    span, parent = _open_span(name, kind, attributes)
+    status = "ok"
+    try:
+        yield span
+    except Exception as e:
+        status = "error"
+        span["attributes"]["error"] = str(e)
+        raise
+    finally:
+        # Close iteration, LLM or tool spans left open when the block finishes
+        current = _current_span.get()
+        while current and current is not span and "_parent" in current:
+            current_parent = current.pop("_parent")
+            _close_span(current, current_parent, status)
+            current = current_parent
+        _close_span(span, parent, status)
+
+
+def record_token_usage(span, crew_output):
+    """
+    Add the token usage of a finished crew, or of a direct litellm completion,
+    to its span and to the totals of the current run
+    """
+    usage = getattr(crew_output, "token_usage", None) or getattr(crew_output, "usage", None)
+    if usage:
+        counts = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "llm_requests": getattr(usage, "successful_requests", 1),
+        }
+        span["attributes"].update(counts)
+        run = _run.get()
+        if run:
+            for key, value in counts.items():
+                run["token_usage"][key] = run["token_usage"].get(key, 0) + (value or 0)
+
+
+def current_token_usage():
+    """Token usage recorded so far by the crews of the current run"""
+    run = _run.get()
+    return dict(run["token_usage"]) if run else {}
+
+
+def _iteration_span():
+    """The agent iteration span LLM and tool spans nest under, opened on demand"""
+    current = _current_span.get()
+    if current and current["kind"] == "crew":
+        current["_iterations"] = current.get("_iterations", 0) + 1
+        span, _ = _open_span(f"iteration {current['_iterations']}", "agent_iteration", {}, parent=current)
+        span["_parent"] = current
+        current = span
+    return current
+
+
+def trace_step(step):
+    """Crew step_callback: close the span of the agent iteration that just finished"""
+    current = _current_span.get()
+    if not current or current["kind"] != "agent_iteration":
+        return
+
+    current["attributes"]["step"] = type(step).__name__
+    if isinstance(step, AgentFinish):
+        current["attributes"]["final"] = True
+    else:
+        current["attributes"]["tool"] = getattr(step, "tool", None)
+        current["attributes"]["tool_input"] = str(getattr(step, "tool_input", ""))[:200]
+    current["attributes"]["thought"] = (getattr(step, "thought", "") or "")[:200]
+    _close_span(current, current.pop("_parent"))
+
+
+def trace_task(output):
+    """Crew task_callback: record which agent finished the task and how long its output is"""
+    current = _current_span.get()
+    if current and current["kind"] == "agent_iteration":
+        _close_span(current, current.pop("_parent"))
+        current = _current_span.get()
+    if current and current["kind"] == "crew":
+        current["attributes"]["tasks_completed"] = current["attributes"].get("tasks_completed", 0) + 1
+        current["attributes"]["agent"] = str(getattr(output, "agent", "")).strip()
+        current["attributes"]["output_chars"] = len(getattr(output, "raw", "") or "")
+
+
+def _count_tokens(model, **kwargs):
+    try:
+        return litellm.token_counter(model=model, **kwargs)
+    except Exception:
+        return None
+
+
+@crewai_event_bus.on(LLMCallStartedEvent)
+def _on_llm_call_started(source, event):
+    if not exporter:
+        return
+    parent = _iteration_span()
+    model = getattr(source, "model", None)
+    messages = event.messages if isinstance(event.messages, list) else [{"role": "user", "content": event.messages}]
+    span, _ = _open_span("llm request", "llm", {
+        "model": model,
+        "prompt_tokens": _count_tokens(model, messages=messages),
+    }, parent=parent)
+    span["_parent"] = parent
+
+
+def _on_llm_call_finished(source, event, status):
+    current = _current_span.get()
+    if not current or current["kind"] != "llm":
+        return
+    if status == "ok":
+        current["attributes"]["completion_tokens"] = _count_tokens(
+            current["attributes"]["model"], text=str(event.response)
+        )
+    else:
+        current["attributes"]["error"] = event.error
+    _close_span(current, current.pop("_parent"), status)
+
+
+@crewai_event_bus.on(LLMCallCompletedEvent)
+def _on_llm_call_completed(source, event):
+    _on_llm_call_finished(source, event, "ok")
+
+
+@crewai_event_bus.on(LLMCallFailedEvent)
+def _on_llm_call_failed(source, event):
+    _on_llm_call_finished(source, event, "error")
+
+
+@crewai_event_bus.on(ToolUsageStartedEvent)
+def _on_tool_started(source, event):
+    if not exporter:
+        return
+    parent = _iteration_span()
+    span, _ = _open_span(f"tool {event.tool_name}", "tool", {
+        "tool": event.tool_name,
+        "tool_args": str(event.tool_args)[:200],
+    }, parent=parent)
+    span["_parent"] = parent
+
+
+def _on_tool_finished(event, status):
+    current = _current_span.get()
+    if not current or current["kind"] != "tool":
+        return
+    if status == "ok":
+        current["attributes"]["from_cache"] = event.from_cache
+    else:
+        current["attributes"]["error"] = str(event.error)
+    _close_span(current, current.pop("_parent"), status)
+
+
+@crewai_event_bus.on(ToolUsageFinishedEvent)
+def _on_tool_finished_ok(source, event):
+    _on_tool_finished(event, "ok")
+
+
+@crewai_event_bus.on(ToolUsageErrorEvent)
+def _on_tool_error(source, event):
+    _on_tool_finished(event, "error")
@@ -0,0 +1,101 @@
+import os
+import functools
+from unittest import mock
+import mongomock
+import pytest
+import requests
+
+# No telemetry or real search calls from the crews built in tests
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("SERPER_API_KEY", "stub")
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+# LinkedIn rate limits loose enough for tests publishing many posts
+UNLIMITED = {"member": (10 ** 6, 10 ** 6), "app": (10 ** 6, 10 ** 6)}
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, content=b""):
+        self.status_code = status_code
+        self.payload = payload
+        self.content = content
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+
+class FakeLinkedIn:
+    """Answers the LinkedIn API calls made through requests and records the created posts"""
+
+    def __init__(self):
+        self.posts = []
+        self.create_calls = 0
+        # Number of upcoming create calls that publish the post but fail to answer
+        self.lose_responses = 0
+        # Image bytes uploaded to LinkedIn, in order
+        self.uploads = []
+
+    def request(self, method, url, **kwargs):
+        if "action=registerUpload" in url:
+            return FakeResponse(200, {"value": {
+                "uploadMechanism": {
+                    "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {"uploadUrl": "https://upload.test/1"}
+                },
+                "asset": "urn:li:digitalmediaAsset:test"
+            }})
+        if method == "PUT":
+            self.uploads.append(kwargs["data"])
+            return FakeResponse(201)
+        if method == "POST" and url.endswith("/ugcPosts"):
+            self.create_calls += 1
+            post_id = f"urn:li:share:{len(self.posts) + 1}"
+            self.posts.append({"id": post_id, **kwargs["json"]})
+            if self.lose_responses:
+                self.lose_responses -= 1
+                raise requests.ConnectionError("Connection reset by peer")
+            return FakeResponse(201, {"id": post_id})
+        if method == "GET" and "/ugcPosts?q=authors" in url:
+            return FakeResponse(200, {"elements": list(reversed(self.posts))})
+        raise Exception(f"Unexpected LinkedIn call: {method} {url}")
+
+    def get(self, url, **kwargs):
+        # Image downloads
+        return FakeResponse(200, content=b"image")
+
+
+@pytest.fixture
+def linkedin_api(monkeypatch):
+    """Fake LinkedIn API behind requests, with the shared rate limiter on fresh, loose buckets"""
+    from helpers.rate_limiter import linkedin_rate_limiter, MemoryBucketBackend
+
+    fake = FakeLinkedIn()
+    monkeypatch.setattr(requests, "request", fake.request)
+    monkeypatch.setattr(requests, "get", fake.get)
+    monkeypatch.setattr(linkedin_rate_limiter, "backend", MemoryBucketBackend())
+    monkeypatch.setattr(linkedin_rate_limiter, "limits", {
+        endpoint: UNLIMITED for endpoint in ("assets", "upload", "ugcPosts")
+    })
+    return fake
+
+
+@pytest.fixture
+def linkedin_app(monkeypatch, linkedin_api):
+    """
+    linkedin_post_app on an in-memory MongoDB with its scheduled jobs paused,
+    writing posts with stub LLMs and publishing rendered cards to the fake LinkedIn API
+    """
+    # The module connects and schedules its jobs when it is first imported
+    with mock.patch("pymongo.MongoClient", lambda *args, **kwargs: mongomock.MongoClient()):
+        import linkedin_post_app
+    from ai_agents.linkedin_create_post_flow import LinkedInFlow
+    from ai_agents.stub_llm import StubLLM
+
+    linkedin_post_app.scheduler.pause()
+    monkeypatch.setattr(linkedin_post_app, "client", mongomock.MongoClient())
+    monkeypatch.setattr(linkedin_post_app, "IMAGE_MODE", "card")
+    monkeypatch.setattr(
+        linkedin_post_app, "LinkedInFlow", functools.partial(LinkedInFlow, agent_llm=StubLLM(topic="Test topic"))
+    )
+    return linkedin_post_app
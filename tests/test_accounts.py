@@ -0,0 +1,78 @@
+import threading
+import time
+from bson import ObjectId
+from helpers.accounts import FanOut
+
+
+def make_account(name):
+    return {"_id": ObjectId(), "name": name, "access_token": f"secret-{name}", "person_urn": name}
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_submit_returns_before_publishes_finish():
+    release = threading.Event()
+    pool = FanOut(max_workers=2)
+    accounts = [make_account(f"account-{i}") for i in range(4)]
+
+    started = time.perf_counter()
+    submission = pool.submit(accounts, lambda account: release.wait(5))
+    assert time.perf_counter() - started < 0.5
+    assert submission["submitted"] == [str(account["_id"]) for account in accounts]
+    assert len(pool.report()["in_flight"]) == 4
+
+    release.set()
+    wait_until(lambda: pool.report()["finished"] == 4)
+    pool.shutdown()
+
+
+def test_account_in_flight_is_not_submitted_again():
+    release = threading.Event()
+    pool = FanOut(max_workers=2)
+    slow, other = make_account("slow"), make_account("other")
+
+    pool.submit([slow], lambda account: release.wait(5))
+    submission = pool.submit([slow, other], lambda account: None)
+    assert submission == {"submitted": [str(other["_id"])], "skipped_in_flight": [str(slow["_id"])]}
+
+    release.set()
+    wait_until(lambda: pool.report()["finished"] == 2)
+    assert pool.submit([slow], lambda account: None)["submitted"] == [str(slow["_id"])]
+    pool.shutdown()
+
+
+def test_failures_are_isolated_and_reports_carry_no_credentials():
+    pool = FanOut(max_workers=4)
+    accounts = [make_account(f"account-{i}") for i in range(6)]
+
+    def publish(account):
+        if account["name"] == "account-3":
+            raise Exception("LinkedIn said no")
+
+    submission = pool.submit(accounts, publish)
+    wait_until(lambda: pool.report()["finished"] == 6)
+    report = pool.report()
+    pool.shutdown()
+
+    assert report["succeeded"] == 5
+    assert [result["name"] for result in report["per_account"] if result["status"] == "failed"] == ["account-3"]
+    assert "secret-" not in repr(report) + repr(submission)
+
+
+def test_report_includes_throughput_of_parallel_publishes():
+    pool = FanOut(max_workers=4)
+    assert pool.report()["throughput_per_minute"] == 0
+
+    pool.submit([make_account(f"account-{i}") for i in range(8)], lambda account: time.sleep(0.2))
+    wait_until(lambda: pool.report()["finished"] == 8)
+    report = pool.report()
+    pool.shutdown()
+
+    # Two rounds of four 0.2s publishes: 8 in ~0.4s is ~1200 per minute, one at a time would be 300
+    assert 600 < report["throughput_per_minute"] <= 1200
+    assert all(result["latency_seconds"] >= 0.2 for result in report["per_account"])
@@ -0,0 +1,95 @@
+import random
+from datetime import datetime, timedelta
+import mongomock
+import pytest
+from helpers.analytics import (
+    SKETCH_RELATIVE_ACCURACY, LatencySketch, record_post_outcome, revert_post_outcome, summarize
+)
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def latencies(count, seed=7):
+    generator = random.Random(seed)
+    return [generator.lognormvariate(3, 1) for _ in range(count)]
+
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def assert_within_bound(estimate, exact):
+    # Quantiles are rounded to the millisecond on top of the sketch error
+    assert abs(estimate - exact) <= SKETCH_RELATIVE_ACCURACY * exact + 0.0005
+
+
+@pytest.mark.parametrize("q", QUANTILES)
+def test_sketch_quantiles_stay_within_the_relative_error(q):
+    values = latencies(50000)
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    assert_within_bound(sketch.quantile(q), exact_quantile(values, q))
+
+
+def test_merged_hourly_sketches_equal_one_sketch_of_all_samples():
+    values = latencies(24000)
+    hours = [LatencySketch() for _ in range(24)]
+    whole = LatencySketch()
+    for index, value in enumerate(values):
+        hours[index % 24].add(value)
+        whole.add(value)
+
+    merged = LatencySketch()
+    for hour in hours:
+        # Rollups come back from Mongo with string bucket keys
+        merged.merge({str(index): count for index, count in hour.buckets.items()})
+
+    assert merged.buckets == whole.buckets
+    for q in QUANTILES:
+        assert_within_bound(merged.quantile(q), exact_quantile(values, q))
+
+
+def test_summary_merges_rollups_across_days():
+    rollups = mongomock.MongoClient().db.post_rollups
+    start = datetime(2026, 3, 2, 9)
+    values = latencies(200)
+    for index, seconds in enumerate(values):
+        # Two posts an hour, Monday 9:00 to Friday 12:30
+        posted_at = start + timedelta(minutes=30 * index)
+        record_post_outcome(rollups, "success", posted_at=posted_at, stage_seconds={"content": seconds},
+                            token_usage={"total_tokens": 10})
+    record_post_outcome(rollups, "failed", posted_at=start, failure_cause="publish:HTTPError")
+
+    summary = summarize(rollups, start, start + timedelta(days=30))
+
+    assert summary["posts"] == 201
+    assert summary["status"] == {"success": 200, "failed": 1}
+    assert summary["failures"] == {"publish:HTTPError": 1}
+    assert summary["tokens"] == {"total_tokens": 2000}
+    assert summary["success_rate"] == round(200 / 201, 4)
+    content = summary["latency_seconds"]["content"]
+    assert content["count"] == 200
+    for q in (0.5, 0.9, 0.99):
+        assert_within_bound(content[f"p{round(q * 100)}"], exact_quantile(values, q))
+
+    by_day = summarize(rollups, start, start + timedelta(days=30), group_by="day")
+    assert sum(day["posts"] for day in by_day.values()) == 201
+    assert list(by_day) == sorted(by_day) and len(by_day) == 5
+    by_weekday = summarize(rollups, start, start + timedelta(days=30), group_by="weekday")
+    assert list(by_weekday) == ["monday", "tuesday", "wednesday", "thursday", "friday"]
+
+
+def test_reverted_outcome_leaves_no_trace_in_the_summary():
+    rollups = mongomock.MongoClient().db.post_rollups
+    posted_at = datetime(2026, 3, 2, 9)
+    failure = record_post_outcome(rollups, "failed", posted_at=posted_at, stage_seconds={"content": 3.0},
+                                  failure_cause="content:Exception")
+    record_post_outcome(rollups, "success", posted_at=posted_at, stage_seconds={"content": 4.0})
+
+    revert_post_outcome(rollups, failure)
+    summary = summarize(rollups, posted_at, posted_at)
+
+    assert summary["posts"] == 1 and summary["status"] == {"success": 1} and summary["failures"] == {}
+    assert summary["latency_seconds"]["content"]["count"] == 1
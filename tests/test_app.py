@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+import mongomock
+import pytest
+import pytz
+from fastapi.testclient import TestClient
+import app as scheduler_app
+from helpers.accounts import add_account
+from helpers.http_cache import ResponseCache
+from helpers.schedule_engine import ScheduleEngine
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(scheduler_app, "client", mongomock.MongoClient())
+    monkeypatch.setattr(scheduler_app, "schedule_engine", ScheduleEngine())
+    monkeypatch.setattr(scheduler_app, "current_job_id", None)
+    monkeypatch.setattr(scheduler_app, "response_cache", ResponseCache(ttl=60))
+    return TestClient(scheduler_app.app)
+
+
+def test_next_post_time_includes_account_schedules(client):
+    soon = datetime.now(pytz.utc) + timedelta(hours=1)
+    schedule = {"days": list(range(7)), "hour": soon.hour, "minute": soon.minute, "timezone": "UTC"}
+    account_id = add_account(scheduler_app.get_account_collection(), "acme", "token", "urn", schedule=schedule)
+
+    body = client.get("/next-post-time/").json()
+    assert body["account_id"] == str(account_id)
+    assert 0 < body["countdown_seconds"] <= 3600
+
+
+def test_next_post_time_falls_back_to_default_schedule(client):
+    body = client.get("/next-post-time/").json()
+    assert body["account_id"] is None
+    assert body["countdown_seconds"] > 0
+
+
+def test_next_post_time_is_served_from_cache_within_ttl(client):
+    first = client.get("/next-post-time/")
+    second = client.get("/next-post-time/")
+    assert second.content == first.content
+
+    stats = client.get("/cache-stats/").json()["endpoints"]["next-post-time"]
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_next_post_time_answers_304_to_matching_etag(client):
+    etag = client.get("/next-post-time/").headers["etag"]
+    assert etag.startswith('W/"')
+    assert client.get("/next-post-time/", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,56 @@
+import json
+import pytest
+import bulk_generate
+
+
+def read_drafts(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def batch_args(path, count=5):
+    return ["--count", str(count), "--concurrency", "4", "--dry-run", "--output", str(path)]
+
+
+def test_load_completed_cuts_off_a_partial_trailing_line(tmp_path):
+    path = tmp_path / "drafts.ndjson"
+    path.write_text('{"index": 0}\n{"index": 2}\nnot json\n{"index": 3, "topic": "cut o')
+
+    assert bulk_generate.load_completed(str(path)) == {0, 2}
+    assert path.read_text() == '{"index": 0}\n{"index": 2}\nnot json\n'
+    assert bulk_generate.load_completed(str(tmp_path / "missing.ndjson")) == set()
+
+
+def test_interrupted_batch_resumes_with_the_missing_and_failed_drafts(tmp_path, monkeypatch):
+    path = tmp_path / "drafts.ndjson"
+    generate_draft = bulk_generate.generate_draft
+    calls = []
+
+    def flaky_generate(index, args):
+        calls.append(index)
+        if index in failing:
+            raise Exception("LLM unavailable")
+        return generate_draft(index, args)
+    monkeypatch.setattr(bulk_generate, "generate_draft", flaky_generate)
+
+    failing = {1, 3}
+    with pytest.raises(SystemExit):
+        bulk_generate.main(batch_args(path))
+    assert sorted(calls) == [0, 1, 2, 3, 4]
+    assert sorted(draft["index"] for draft in read_drafts(path)) == [0, 2, 4]
+
+    # The process was killed halfway through writing draft 1
+    with open(path, "a") as output:
+        output.write('{"index": 1, "topic": "Dry run')
+
+    failing, calls[:] = set(), []
+    report = bulk_generate.run_batch(bulk_generate.parse_args(batch_args(path)))
+
+    assert sorted(calls) == [1, 3]
+    assert report["generated"] == 2 and report["skipped"] == 3 and report["failed"] == []
+    drafts = read_drafts(path)
+    assert sorted(draft["index"] for draft in drafts) == [0, 1, 2, 3, 4]
+    assert all(draft["topic"] == f"Dry run topic {draft['index']}" for draft in drafts)
+
+    calls[:] = []
+    report = bulk_generate.run_batch(bulk_generate.parse_args(batch_args(path)))
+    assert calls == [] and report["generated"] == 0 and report["skipped"] == 5
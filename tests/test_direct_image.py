@@ -0,0 +1,76 @@
+import base64
+from types import SimpleNamespace
+import pytest
+from helpers import direct_image
+from helpers.direct_image import IMAGE_MODEL, MAX_PROMPT_FIELD, build_image_prompt, generate_image_direct
+
+
+class FakeImageClient:
+    """Answers images.generate like the OpenAI client and records the requests"""
+
+    def __init__(self, url="https://images.test/1.png", image=b"png"):
+        self.requests = []
+        self.url = url
+        self.image = image
+        self.images = self
+
+    def generate(self, **kwargs):
+        self.requests.append(kwargs)
+        if kwargs["response_format"] == "b64_json":
+            return SimpleNamespace(data=[SimpleNamespace(url=None, b64_json=base64.b64encode(self.image).decode())])
+        return SimpleNamespace(data=[SimpleNamespace(url=self.url, b64_json=None)])
+
+
+def test_prompt_uses_the_topic_and_the_quoted_headline():
+    prompt = build_image_prompt("AI for  small\nteams", 'Ship "one" feature')
+
+    assert "LinkedIn post about AI for small teams." in prompt
+    assert "The post opens with: \"Ship 'one' feature\"." in prompt
+
+
+def test_prompt_fields_fall_back_to_each_other_and_are_truncated():
+    assert "post about Only a headline." in build_image_prompt(None, "Only a headline")
+    assert "post about artificial intelligence." in build_image_prompt("", "")
+
+    prompt = build_image_prompt("t" * 1000, "h" * 1000)
+    assert "t" * MAX_PROMPT_FIELD + "." in prompt and "t" * (MAX_PROMPT_FIELD + 1) not in prompt
+    assert "h" * MAX_PROMPT_FIELD + "\"" in prompt and "h" * (MAX_PROMPT_FIELD + 1) not in prompt
+
+
+def test_one_image_call_with_the_template_prompt():
+    image_client = FakeImageClient()
+
+    url = generate_image_direct("AI for small teams", "Ship one feature", image_client=image_client)
+
+    assert url == "https://images.test/1.png"
+    [request] = image_client.requests
+    assert request["prompt"] == build_image_prompt("AI for small teams", "Ship one feature")
+    assert request["model"] == IMAGE_MODEL and request["n"] == 1 and request["response_format"] == "url"
+
+
+def test_fused_prompt_replaces_the_template():
+    image_client = FakeImageClient()
+
+    generate_image_direct("topic", "headline", image_client=image_client, prompt="A lighthouse over a data center")
+
+    assert image_client.requests[0]["prompt"] == "A lighthouse over a data center"
+
+
+def test_b64_response_is_decoded_and_a_missing_url_raises():
+    assert generate_image_direct("topic", "headline", "b64_json", FakeImageClient(image=b"\x89PNG")) == b"\x89PNG"
+
+    with pytest.raises(Exception, match="returned no URL"):
+        generate_image_direct("topic", "headline", image_client=FakeImageClient(url=None))
+
+
+def test_app_passes_the_fused_image_prompt_to_the_image_api(linkedin_app, monkeypatch):
+    image_client = FakeImageClient()
+    monkeypatch.setattr(direct_image, "client", image_client)
+    outputs = {"topic": "AI for small teams", "formatted_content": "Ship one feature\n\nBody"}
+
+    assert linkedin_app.generate_image({**outputs, "image_prompt": "A fused prompt"}, "direct") == image_client.url
+    assert linkedin_app.generate_image(outputs, "direct") == image_client.url
+
+    fused, template = (request["prompt"] for request in image_client.requests)
+    assert fused == "A fused prompt"
+    assert template == build_image_prompt("AI for small teams", "Ship one feature")
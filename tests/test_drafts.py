@@ -0,0 +1,95 @@
+import json
+import pytest
+from bson import ObjectId
+from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+from ai_agents.stub_llm import StubLLM
+
+
+class StreamingStubLLM(StubLLM):
+    """Stub LLM streaming its answer word by word, like a client built with stream=True"""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        response = super().call(messages, tools, callbacks, available_functions)
+        for word in response.split(" "):
+            crewai_event_bus.emit(self, event=LLMStreamChunkEvent(chunk=word + " "))
+        return response
+
+
+class FailingLLM(StubLLM):
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        raise Exception("LLM unavailable")
+
+
+def read_events(response):
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        if block:
+            event, data = block.split("\n")
+            events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+@pytest.fixture
+def client(linkedin_app, monkeypatch):
+    monkeypatch.setattr(linkedin_app, "build_llm", lambda stream=False: StreamingStubLLM(topic="Draft topic"))
+    return linkedin_app.app.test_client()
+
+
+def test_stream_sends_tokens_then_the_draft_then_done(client, linkedin_app):
+    response = client.get("/drafts/stream")
+    events = read_events(response)
+    kinds = [kind for kind, _ in events]
+
+    assert response.mimetype == "text/event-stream"
+    assert kinds[-2:] == ["draft", "done"]
+    assert set(kinds[:-2]) == {"token"}
+    assert "Draft topic" in "".join(data["text"] for _, data in events[:-2])
+
+    draft = events[-2][1]
+    assert events[-1][1] == {"draft_id": draft["draft_id"]}
+    assert draft["approve_url"] == f"/drafts/{draft['draft_id']}/approve"
+    stored = linkedin_app.get_draft_collection().find_one({"_id": ObjectId(draft["draft_id"])})
+    assert stored["content"] == draft["content"] and stored["status"] == "draft"
+
+
+def test_stream_reports_llm_failures(client, monkeypatch, linkedin_app):
+    monkeypatch.setattr(linkedin_app, "build_llm", lambda stream=False: FailingLLM())
+
+    events = read_events(client.get("/drafts/stream"))
+
+    assert events[-1][0] == "error"
+    assert "draft" not in [kind for kind, _ in events]
+
+
+def test_stream_reports_failures_after_generation(client, monkeypatch, linkedin_app):
+    def enforce_length(text):
+        raise Exception("Post cannot be shortened")
+    monkeypatch.setattr(linkedin_app, "enforce_length", enforce_length)
+
+    events = read_events(client.get("/drafts/stream"))
+
+    assert events[-1] == ("error", {"message": "Post cannot be shortened"})
+    assert linkedin_app.get_draft_collection().count_documents({}) == 0
+
+
+def test_approving_a_draft_publishes_it_once(client, linkedin_app, linkedin_api):
+    draft = read_events(client.get("/drafts/stream"))[-2][1]
+
+    response = client.post(draft["approve_url"])
+    assert response.status_code == 200
+    post_id = response.get_json()["post_id"]
+    assert len(linkedin_api.posts) == 1
+    commentary = linkedin_api.posts[0]["specificContent"]["com.linkedin.ugc.ShareContent"]["shareCommentary"]
+    assert commentary["text"] == draft["content"]
+
+    stored = linkedin_app.get_draft_collection().find_one({"_id": ObjectId(draft["draft_id"])})
+    assert stored["status"] == "published" and stored["post_id"] == post_id
+
+    again = client.post(draft["approve_url"])
+    assert again.status_code == 409 and again.get_json()["post_id"] == post_id
+    assert len(linkedin_api.posts) == 1
+
+
+def test_approve_rejects_unknown_drafts(client):
+    assert client.post("/drafts/not-an-id/approve").status_code == 400
+    assert client.post(f"/drafts/{ObjectId()}/approve").status_code == 404
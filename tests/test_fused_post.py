@@ -0,0 +1,105 @@
+import json
+import crewai.task
+import pytest
+from ai_agents.linkedin_create_post_flow import LinkedInFlow
+from ai_agents.stub_llm import StubLLM
+from helpers import tracing
+from helpers.post_length import HASHTAG_PATTERN, LINKEDIN_MAX_CHARS, linkedin_char_count
+from helpers.post_scoring import score_post
+from helpers.reformat_md_files import convert_md_to_linkedin_format
+
+TOPIC = "Shipping AI features with a small team"
+
+
+class OffSchemaLLM(StubLLM):
+    """Answers the fused prompt with plain text instead of the JSON schema"""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        self.calls += 1
+        return f"Thought: I now know the final answer\nFinal Answer: {self._post(self.topic)}"
+
+
+class RewordedStubLLM(StubLLM):
+    """Stub writing its posts in other words than StubLLM, with the same structure"""
+
+    @staticmethod
+    def _post(topic):
+        return (
+            f"# {topic}\n\n"
+            f"Most teams get {topic.lower()} wrong in the first month.\n\n"
+            "- Pick one workflow\n- Track the hours saved\n\n"
+            "Where would you start? #AI #SMB"
+        )
+
+
+def run(mode, llm=None, **kwargs):
+    flow = LinkedInFlow(agent_llm=llm or StubLLM(topic=TOPIC), mode=mode, **kwargs)
+    return flow.kickoff(), flow.state
+
+
+def structure(post):
+    """Shape of a post once formatted for LinkedIn, independent of its wording"""
+    formatted = convert_md_to_linkedin_format(post)
+    lines = formatted.split("\n")
+    return {
+        "hook_has_topic": TOPIC in lines[0],
+        "bullets": sum(line.startswith("• ") for line in lines),
+        "paragraphs": len([block for block in formatted.split("\n\n") if block.strip()]),
+        "hashtags": sorted(set(HASHTAG_PATTERN.findall(formatted))),
+        "markdown_left": any(line.startswith(("# ", "- ", "* ")) for line in lines),
+        "fits_linkedin": linkedin_char_count(formatted) <= LINKEDIN_MAX_CHARS,
+        "score_fields": sorted(score_post(formatted)),
+    }
+
+
+def crew_spans(path):
+    return [span["name"] for span in map(json.loads, path.read_text().splitlines()) if span["kind"] == "crew"]
+
+
+def test_fused_and_crews_modes_produce_equivalent_posts(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "exporter", tracing.JsonLinesExporter(str(tmp_path / "crews.jsonl")))
+    with tracing.trace_run("crews"):
+        crews_post, crews_state = run("crews")
+    monkeypatch.setattr(tracing, "exporter", tracing.JsonLinesExporter(str(tmp_path / "fused.jsonl")))
+    with tracing.trace_run("fused"):
+        fused_post, fused_state = run("fused", RewordedStubLLM(topic=TOPIC))
+
+    assert fused_post != crews_post
+    assert fused_state.topic == crews_state.topic == TOPIC
+    assert fused_post == fused_state.post and crews_post == crews_state.post
+    assert structure(fused_post) == structure(crews_post)
+    assert structure(fused_post)["hook_has_topic"] and structure(fused_post)["bullets"] == 2
+    assert not structure(fused_post)["markdown_left"]
+
+    # Only the fused mode writes an image prompt, in one crew instead of two
+    assert TOPIC in fused_state.image_prompt and crews_state.image_prompt == ""
+    assert crew_spans(tmp_path / "crews.jsonl") == ["topic creator", "post creator"]
+    assert crew_spans(tmp_path / "fused.jsonl") == ["fused post creator"]
+
+
+def test_fused_mode_makes_a_single_llm_call():
+    llm = StubLLM(topic=TOPIC)
+    LinkedInFlow(agent_llm=llm, mode="fused").kickoff()
+    assert llm.calls == 1
+
+
+def test_fused_post_competes_with_the_other_variants():
+    post, state = run("fused", variants=3)
+
+    assert len(state.variants) == 3
+    assert post == state.variants[0]["post"]
+    assert state.image_prompt
+
+
+def test_fused_output_off_schema_raises(monkeypatch):
+    # Conversion giving up and keeping the raw answer, as crewAI does when its converter fails
+    monkeypatch.setattr(crewai.task, "convert_to_model", lambda result, *args, **kwargs: result)
+    flow = LinkedInFlow(agent_llm=OffSchemaLLM(topic=TOPIC), mode="fused")
+    with pytest.raises(Exception, match="does not match the schema"):
+        flow.kickoff()
+    assert flow.state.post == "" and flow.state.image_prompt == ""
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(Exception, match="Unknown content mode"):
+        LinkedInFlow(agent_llm=StubLLM(), mode="single")
@@ -0,0 +1,77 @@
+import io
+import threading
+from PIL import Image
+from helpers.image_card import CARD_SIZE, extract_card_content, render_card, render_post_card
+
+POST = (
+    "3 ways small teams can ship AI features this quarter\n\n"
+    "• Start small: pick one workflow with measurable time savings\n"
+    "• **Measure results** - track hours saved per week\n"
+    "1. Iterate with your users before you scale\n"
+    "- Hire later\n\n"
+    "What would you automate first? #AI #SMB"
+)
+
+
+def open_image(data):
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+def test_card_content_is_the_hook_and_the_first_bullets():
+    headline, bullets = extract_card_content(POST)
+
+    assert headline == "3 ways small teams can ship AI features this quarter"
+    assert bullets == ["Start small", "Measure results", "Iterate with your users before you scale"]
+
+
+def test_post_card_renders_a_linkedin_sized_jpeg():
+    card = open_image(render_post_card(POST, template="dark", brand="Ubiquitiz"))
+
+    assert card.format == "JPEG" and card.size == CARD_SIZE and card.mode == "RGB"
+    # The dark template's gradient starts near black and the headline is drawn in white over it
+    assert max(card.getpixel((10, 10))) < 40
+    assert max(channel_max for _, channel_max in card.getextrema()) > 200
+
+
+def test_unknown_template_and_long_headline_still_render():
+    card = open_image(render_card("word " * 200, ["a bullet"] * 10, template="missing", image_format="PNG"))
+
+    assert card.format == "PNG" and card.size == CARD_SIZE
+
+
+def test_slow_image_generation_falls_back_to_a_rendered_card(linkedin_app, linkedin_api, monkeypatch):
+    released = threading.Event()
+
+    def slow_generate_image(outputs, image_mode):
+        released.wait(10)
+        return "https://images.test/late.png"
+    monkeypatch.setattr(linkedin_app, "generate_image", slow_generate_image)
+    monkeypatch.setattr(linkedin_app, "IMAGE_MODE", "direct")
+    monkeypatch.setattr(linkedin_app, "IMAGE_LATENCY_BUDGET", 0.1)
+
+    try:
+        post_id = linkedin_app.post_to_linkedin(idempotency_key="manual:slow-image")
+    finally:
+        released.set()
+
+    assert post_id is not None
+    run = linkedin_app.get_run_collection().find_one({"_id": "manual:slow-image"})
+    assert run["stages"]["image_url"] is None
+    [upload] = linkedin_api.uploads
+    card = open_image(upload)
+    assert card.format == "JPEG" and card.size == CARD_SIZE
+    assert len(linkedin_api.posts) == 1
+
+
+def test_failed_image_generation_falls_back_to_a_rendered_card(linkedin_app, linkedin_api, monkeypatch):
+    def failing_generate_image(outputs, image_mode):
+        raise Exception("Image API unavailable")
+    monkeypatch.setattr(linkedin_app, "generate_image", failing_generate_image)
+    monkeypatch.setattr(linkedin_app, "IMAGE_MODE", "direct")
+
+    assert linkedin_app.post_to_linkedin(idempotency_key="manual:failed-image") is not None
+
+    [upload] = linkedin_api.uploads
+    assert open_image(upload).size == CARD_SIZE
@@ -0,0 +1,47 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ai_agents.linkedin_create_post_flow import LinkedInFlow
+from ai_agents.stub_llm import StubLLM
+
+
+def run_flow(index, latency=0.05):
+    topic = f"Stress topic {index:04d}"
+    flow = LinkedInFlow(agent_llm=StubLLM(topic=topic, latency=latency))
+    return topic, flow.kickoff(), flow.state
+
+
+def test_concurrent_flows_never_mix_state():
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(run_flow, range(48)))
+
+    for topic, post, state in results:
+        assert set(re.findall(r"Stress topic \d{4}", post)) == {topic}
+        assert state.topic == topic
+        assert state.post == post
+
+
+def test_flow_picks_best_of_variants():
+    flow = LinkedInFlow(agent_llm=StubLLM(topic="Variant topic"), variants=3)
+    post = flow.kickoff()
+
+    assert len(flow.state.variants) == 3
+    scores = [variant["scores"]["score"] for variant in flow.state.variants]
+    assert scores == sorted(scores, reverse=True)
+    assert post == flow.state.variants[0]["post"]
+
+
+def flows_per_minute(flows, workers, latency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda index: run_flow(index, latency), range(flows)))
+    return flows / (time.perf_counter() - started) * 60
+
+
+def test_concurrent_flows_raise_throughput():
+    # LLM calls dominate a real flow, the stub waits as long as a short API call
+    sequential = flows_per_minute(8, workers=1, latency=0.2)
+    concurrent = flows_per_minute(8, workers=8, latency=0.2)
+
+    print(f"flows/min: {sequential:.0f} sequential, {concurrent:.0f} on 8 workers")
+    assert concurrent > 3 * sequential
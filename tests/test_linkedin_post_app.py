@@ -0,0 +1,93 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+import pytz
+from helpers.accounts import FanOut, add_account
+from helpers.publish_pipeline import RunInProgressError
+from helpers.schedule_engine import ScheduleEngine
+
+
+def hold_lease(linkedin_app, idempotency_key):
+    """Leave the run as another worker would while it is still publishing"""
+    linkedin_app.get_run_collection().insert_one({
+        "_id": idempotency_key,
+        "status": "running",
+        "lease_expires_at": datetime.now() + timedelta(minutes=10),
+        "stages": {},
+        "started_stages": {}
+    })
+
+
+def failure_records(linkedin_app):
+    return linkedin_app.get_post_collection().count_documents({"status": "failed"})
+
+
+def test_trigger_answers_409_while_another_worker_holds_the_run(linkedin_app, linkedin_api):
+    hold_lease(linkedin_app, "manual:held")
+
+    response = linkedin_app.app.test_client().post("/trigger-post/", headers={"Idempotency-Key": "manual:held"})
+
+    assert response.status_code == 409
+    assert response.get_json()["status"] == "skipped"
+    assert failure_records(linkedin_app) == 0
+    assert linkedin_app.get_rollup_collection().count_documents({}) == 0
+    assert linkedin_api.create_calls == 0
+
+
+def test_scheduled_fire_held_by_another_worker_is_skipped(linkedin_app):
+    hold_lease(linkedin_app, f"scheduled:{datetime.now():%Y-%m-%dT%H:%M}")
+
+    linkedin_app.scheduled_post_to_linkedin()
+
+    assert failure_records(linkedin_app) == 0
+
+
+def test_fan_out_does_not_fail_an_account_whose_run_is_held(linkedin_app, monkeypatch):
+    monkeypatch.setattr(linkedin_app, "schedule_engine", ScheduleEngine())
+    monkeypatch.setattr(linkedin_app, "fan_out_pool", FanOut(max_workers=2))
+    accounts = linkedin_app.get_account_collection()
+    account_id = add_account(accounts, "acme", "token", "urn")
+    due = (datetime.now(pytz.utc) - timedelta(minutes=1)).replace(second=0, microsecond=0)
+    accounts.update_one({"_id": account_id}, {"$set": {"next_run_at": due}})
+    hold_lease(linkedin_app, f"account:{account_id}:{due:%Y-%m-%dT%H:%M}")
+
+    with pytest.raises(RunInProgressError):
+        linkedin_app.post_for_account({**accounts.find_one({"_id": account_id}), "next_run_at": due})
+    assert linkedin_app.fan_out_due_accounts()["submitted"] == [str(account_id)]
+    deadline = time.monotonic() + 10
+    while linkedin_app.fan_out_pool.report()["finished"] < 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    assert "last_status" not in accounts.find_one({"_id": account_id})
+    assert failure_records(linkedin_app) == 0
+
+
+def test_rollups_count_a_retried_run_once(linkedin_app, linkedin_api, monkeypatch):
+    render_post_card = linkedin_app.render_post_card
+    failures = [Exception("Card renderer crashed"), Exception("Card renderer crashed")]
+
+    def flaky_render(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return render_post_card(*args, **kwargs)
+    monkeypatch.setattr(linkedin_app, "render_post_card", flaky_render)
+    client = linkedin_app.app.test_client()
+    headers = {"Idempotency-Key": "manual:retried"}
+
+    def summary():
+        start, end = datetime.now() - timedelta(days=1), datetime.now()
+        return linkedin_app.summarize(linkedin_app.get_rollup_collection(), start, end)
+
+    assert client.post("/trigger-post/", headers=headers).status_code == 500
+    assert client.post("/trigger-post/", headers=headers).status_code == 500
+    failed = summary()
+    assert failed["posts"] == 1 and failed["status"] == {"failed": 1}
+    assert failed["failures"] == {"asset_id:Exception": 1}
+
+    assert client.post("/trigger-post/", headers=headers).status_code == 200
+    succeeded = summary()
+    assert succeeded["posts"] == 1 and succeeded["status"] == {"success": 1}
+    assert succeeded["failures"] == {} and succeeded["success_rate"] == 1.0
+    assert succeeded["latency_seconds"]["total"]["count"] == 1
+    assert linkedin_api.create_calls == 1
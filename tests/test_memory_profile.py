@@ -0,0 +1,91 @@
+import gc
+import time
+import tracemalloc
+from collections import deque
+import pytest
+from helpers.memory_profile import MemoryProfiler, _snapshot
+
+# Traced memory a pipeline run may retain once warmed up
+MAX_GROWTH_PER_RUN = 20 * 1024
+# A tracked run keeps the run, post and rollup documents it stores
+MAX_RETAINED_PER_TRACKED_RUN = 32 * 1024
+
+
+@pytest.fixture
+def tracing():
+    tracemalloc.start(5)
+    yield
+    tracemalloc.stop()
+
+
+@pytest.fixture
+def soak_app(linkedin_app, linkedin_api, monkeypatch):
+    """linkedin_app whose runs are tracked by an enabled profiler, forgetting the uploaded cards"""
+    monkeypatch.setattr(linkedin_api, "uploads", deque(maxlen=0))
+    yield linkedin_app
+    tracemalloc.stop()
+    gc.unfreeze()
+
+
+def post_and_forget(linkedin_app, linkedin_api, key):
+    """Publish a stubbed post, then drop what the fakes stored so only the process can retain memory"""
+    assert linkedin_app.post_to_linkedin(idempotency_key=key) is not None
+    for collection in (
+        linkedin_app.get_run_collection(), linkedin_app.get_post_collection(), linkedin_app.get_rollup_collection()
+    ):
+        collection.delete_many({})
+    linkedin_api.posts.clear()
+
+
+def test_pipeline_memory_stays_flat_across_runs(soak_app, linkedin_api, monkeypatch):
+    warmup, windows, iterations = 20, 3, 80
+    for index in range(warmup):
+        post_and_forget(soak_app, linkedin_api, f"soak:warmup:{index}")
+
+    # Objects from the imports and the warmup are never freed, keep the collections of tracked runs short
+    gc.collect()
+    gc.freeze()
+    profiler = MemoryProfiler(enabled=True, frames=1)
+    monkeypatch.setattr(soak_app, "memory_profiler", profiler)
+
+    # A leak grows every window, bounded caches filling up stay under the limit
+    gc.collect()
+    start = _snapshot()
+    for window in range(windows):
+        for index in range(iterations):
+            post_and_forget(soak_app, linkedin_api, f"soak:{window}:{index}")
+        gc.collect()
+        end = _snapshot()
+        diff = end.compare_to(start, "lineno")
+        start = end
+
+        growth_per_run = sum(stat.size_diff for stat in diff) / iterations
+        top = "\n".join(str(stat) for stat in diff[:5])
+        assert growth_per_run < MAX_GROWTH_PER_RUN, f"window {window}: {growth_per_run / 1024:.1f} KiB per run\n{top}"
+
+    report = profiler.report()
+    assert report["tracked_runs"] == windows * iterations
+    assert report["runs"][-1]["label"] == f"post_to_linkedin soak:{windows - 1}:{iterations - 1}"
+    assert report["mean_retained_per_run"] < MAX_RETAINED_PER_TRACKED_RUN
+
+
+def test_profiler_reports_what_a_run_retains(tracing):
+    profiler = MemoryProfiler(enabled=True)
+    retained = []
+
+    with profiler.track("leaky"):
+        retained.append(bytearray(1024 * 1024))
+    with profiler.track("clean"):
+        bytearray(1024 * 1024)
+
+    leaky, clean = profiler.report()["runs"]
+    assert leaky["label"] == "leaky" and leaky["traced_delta"] > 900 * 1024
+    assert abs(clean["traced_delta"]) < 64 * 1024
+    assert profiler.report()["tracked_runs"] == 2
+
+
+def test_tracking_is_a_no_op_when_disabled():
+    profiler = MemoryProfiler(enabled=False)
+    with profiler.track("skipped"):
+        time.sleep(0)
+    assert profiler.report()["runs"] == []
@@ -0,0 +1,106 @@
+import os
+import tracemalloc
+from datetime import datetime, timedelta
+import mongomock
+import pytest
+from bson import ObjectId
+from helpers.post_archive import INDEX_SUFFIX, archive_old_posts, export_posts, find_post, iter_index, read_archived_post
+
+
+def make_post(posted_at, index=0):
+    return {
+        "_id": ObjectId(),
+        "posted_at": posted_at,
+        "status": "success",
+        "response": {"id": f"urn:li:share:{index}", "text": f"post {index} " + "AI agents for teams " * 40},
+    }
+
+
+def synthetic_posts(count):
+    for index in range(count):
+        yield make_post(datetime(2025, 1, 1) + timedelta(hours=index), index)
+
+
+@pytest.fixture
+def posts_collection(monkeypatch):
+    collection = mongomock.MongoClient().db.posts
+
+    # mongomock's bulk_write does not accept the ReplaceOne of the installed pymongo
+    def bulk_write(requests, ordered=True):
+        modified = sum(
+            collection.replace_one(request._filter, request._doc).modified_count
+            for request in requests
+        )
+        return type("BulkWriteResult", (), {"modified_count": modified})()
+
+    monkeypatch.setattr(collection, "bulk_write", bulk_write)
+    return collection
+
+
+def test_export_and_read_back_every_record(tmp_path):
+    posts = list(synthetic_posts(50))
+    path = str(tmp_path / "posts.ndjson.gz")
+
+    assert export_posts(posts, path, compression="gzip", block_records=8) == 50
+
+    index = list(iter_index(path))
+    assert [post_id for post_id, _, _ in index] == [post["_id"] for post in posts]
+    assert len({offset for _, offset, _ in index}) == 7
+    for post, (post_id, offset, length) in zip(posts, index):
+        location = {"file": path, "offset": offset, "length": length}
+        assert read_archived_post(location, post_id) == post
+
+
+def test_export_memory_does_not_grow_with_the_number_of_posts(tmp_path):
+    peaks = []
+    for count in (1000, 8000):
+        path = str(tmp_path / f"posts-{count}.ndjson.gz")
+        tracemalloc.start()
+        export_posts(synthetic_posts(count), path, compression="gzip")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    small, large = peaks
+    assert large < small * 1.5
+
+
+def test_archive_slims_old_posts_and_keeps_them_readable(tmp_path, posts_collection):
+    old = [make_post(datetime.now() - timedelta(days=200), index) for index in range(30)]
+    recent = make_post(datetime.now(), 99)
+    posts_collection.insert_many(old + [recent])
+    # As stored, Mongo keeps dates to the millisecond
+    old = list(posts_collection.find({"_id": {"$in": [post["_id"] for post in old]}}))
+
+    summary = archive_old_posts(posts_collection, older_than_days=90, archive_dir=str(tmp_path), batch_size=7)
+
+    assert summary["archived"] == 30
+    assert os.path.exists(summary["file"]) and os.path.exists(summary["file"] + INDEX_SUFFIX)
+    for post in old:
+        slim = posts_collection.find_one({"_id": post["_id"]})
+        assert "response" not in slim and slim["archived"]["file"] == summary["file"]
+        assert find_post(posts_collection, post["_id"]) == post
+    assert "archived" not in posts_collection.find_one({"_id": recent["_id"]})
+
+
+def test_archive_requires_an_absolute_archive_dir(posts_collection):
+    posts_collection.insert_one(make_post(datetime.now() - timedelta(days=200)))
+
+    with pytest.raises(Exception, match="POST_ARCHIVE_DIR"):
+        archive_old_posts(posts_collection, archive_dir=None)
+    with pytest.raises(Exception, match="absolute"):
+        archive_old_posts(posts_collection, archive_dir="archives")
+    assert "archived" not in posts_collection.find_one()
+
+
+def test_missing_archive_file_returns_the_slim_post(tmp_path, posts_collection):
+    post = make_post(datetime.now() - timedelta(days=200))
+    posts_collection.insert_one(post)
+    summary = archive_old_posts(posts_collection, older_than_days=90, archive_dir=str(tmp_path))
+    os.remove(summary["file"])
+
+    found = find_post(posts_collection, post["_id"])
+
+    assert found["_id"] == post["_id"]
+    assert found["status"] == "success"
+    assert found["archived"]["file"] == summary["file"]
+    assert "response" not in found
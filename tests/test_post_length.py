@@ -0,0 +1,34 @@
+from helpers.post_length import compress_lists, cap_hashtags, shrink_post, linkedin_char_count
+
+
+def test_compress_lists_keeps_numbered_item_text():
+    text = "Steps:\n1. First point here. More detail.\n2. Second point! Even more."
+    assert compress_lists(text) == "Steps:\n1. First point here.\n2. Second point!"
+
+
+def test_compress_lists_keeps_bullet_item_text():
+    assert compress_lists("• Start small. Then grow.") == "• Start small."
+
+
+def test_compress_lists_caps_items_per_list():
+    items = "\n".join(f"{i}. Item {i}. Detail." for i in range(1, 8))
+    compressed = compress_lists(items, max_items=3).split("\n")
+    assert compressed == ["1. Item 1.", "2. Item 2.", "3. Item 3."]
+
+
+def test_cap_hashtags_deduplicates_and_caps():
+    text = "Body\n\n#AI #AI #SMB #a #b #c #d"
+    assert cap_hashtags(text, max_hashtags=3) == "Body\n\n#AI #SMB #a"
+
+
+def test_shrink_post_fits_limit_and_keeps_hook_and_hashtags():
+    sections = [f"Section {i}. " + "x" * 400 for i in range(10)]
+    text = "\n\n".join(["Hook line"] + sections + ["Call to action?", "#AI #SMB"])
+    shrunk = shrink_post(text, limit=1500)
+    assert linkedin_char_count(shrunk) <= 1500
+    assert shrunk.startswith("Hook line")
+    assert shrunk.endswith("Call to action?\n\n#AI #SMB")
+
+
+def test_linkedin_char_count_counts_emoji_twice():
+    assert linkedin_char_count("a🚀") == 3
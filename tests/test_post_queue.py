@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+import mongomock
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from helpers.post_queue import PostQueue
+
+
+class AtomicCollection:
+    """mongomock collection whose operations run one at a time, like single document writes on a server"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+
+        def atomic(*args, **kwargs):
+            with self.lock:
+                return method(*args, **kwargs)
+        return atomic
+
+
+@pytest.fixture(params=["mongomock", "mongodb"])
+def collection(request):
+    if request.param == "mongomock":
+        yield AtomicCollection(mongomock.MongoClient().db.post_queue)
+        return
+
+    client = MongoClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"), serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("no MongoDB reachable on MONGODB_URL")
+    collection = client.linkedin_posts[f"post_queue_test_{uuid.uuid4().hex[:8]}"]
+    yield collection
+    collection.drop()
+    client.close()
+
+
+def drain(queue, workers, work_seconds):
+    """Run workers until the queue is empty, returning completions per post and the elapsed seconds"""
+    completed = Counter()
+    lock = threading.Lock()
+
+    def worker():
+        worker_id = str(uuid.uuid4())
+        while True:
+            post = queue.claim(worker_id)
+            if post is None:
+                return
+            # Stand-in for generating and publishing the post
+            time.sleep(work_seconds)
+            if queue.complete(post):
+                with lock:
+                    completed[post["_id"]] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return completed, time.perf_counter() - started
+
+
+def test_concurrent_workers_complete_every_post_exactly_once(collection):
+    queue = PostQueue(collection, lease_seconds=30)
+    queue.ensure_indexes()
+    post_ids = [queue.enqueue(f"post {i}") for i in range(200)]
+
+    completed, _ = drain(queue, workers=8, work_seconds=0.001)
+
+    assert set(completed) == set(post_ids)
+    assert max(completed.values()) == 1
+    assert queue.stats() == {"done": 200}
+
+
+def test_throughput_grows_with_workers(collection):
+    throughput = {}
+    for workers in (1, 2, 4, 8):
+        collection.delete_many({})
+        queue = PostQueue(collection, lease_seconds=30)
+        for i in range(80):
+            queue.enqueue(f"post {i}")
+        completed, seconds = drain(queue, workers, work_seconds=0.02)
+        assert sum(completed.values()) == 80
+        throughput[workers] = 80 / seconds
+
+    print("posts/s by workers: " + ", ".join(f"{workers}: {rate:.0f}" for workers, rate in throughput.items()))
+    # Loose bounds, linear scaling would be 2x, 4x and 8x
+    assert throughput[2] > 1.5 * throughput[1]
+    assert throughput[4] > 2.5 * throughput[1]
+    assert throughput[8] > 4 * throughput[1]
+
+
+def test_worker_that_lost_its_lease_cannot_complete(collection):
+    queue = PostQueue(collection, lease_seconds=30)
+    post_id = queue.enqueue("post")
+    stale = queue.claim("worker-a")
+
+    # The lease of worker-a runs out and another worker takes the post over
+    collection.update_one({"_id": post_id}, {"$set": {"lease_expires_at": datetime.now() - timedelta(seconds=1)}})
+    assert queue.release_expired() == (1, 0)
+    current = queue.claim("worker-b")
+
+    assert current["_id"] == post_id and current["attempts"] == 2
+    assert queue.complete(stale) is False
+    assert queue.fail(stale, "too late") is None
+    assert queue.complete(current) is True
+    assert queue.stats() == {"done": 1}
+
+
+def test_post_is_dead_lettered_after_max_attempts(collection):
+    queue = PostQueue(collection, lease_seconds=30, max_attempts=2)
+    queue.enqueue("post")
+
+    assert queue.fail(queue.claim(), "first", retry_delay=0) == "queued"
+    assert queue.fail(queue.claim(), "second", retry_delay=0) == "dead"
+    assert queue.claim() is None
+    assert queue.stats() == {"dead": 1}
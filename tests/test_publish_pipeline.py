@@ -0,0 +1,120 @@
+from collections import Counter
+from datetime import datetime, timedelta
+import mongomock
+import pytest
+from helpers.linked_post_image_api import create_linkedin_post_with_image, find_recent_post_by_text
+from helpers.publish_pipeline import RunInProgressError, run_pipeline, run_pipeline_with_retries
+
+
+@pytest.fixture
+def runs():
+    return mongomock.MongoClient().db.post_runs
+
+
+def counting_stages(calls, fail=()):
+    """Stages a, b and c recording their calls, the ones named in fail raise once"""
+    failing = set(fail)
+
+    def stage(name):
+        def run(outputs):
+            calls[name] += 1
+            if name in failing:
+                failing.discard(name)
+                raise Exception(f"stage {name} failed")
+            return f"{name}:{len(outputs)}"
+        return name, run
+
+    return [stage("a"), stage("b"), stage("c")]
+
+
+def test_rerun_resumes_from_the_failed_stage(runs):
+    calls = Counter()
+    stages = counting_stages(calls, fail=["b"])
+
+    with pytest.raises(Exception, match="stage b failed"):
+        run_pipeline(runs, "key", stages)
+    failed = runs.find_one({"_id": "key"})
+    assert failed["status"] == "failed" and failed["failed_stage"] == "b"
+    assert failed["stages"] == {"a": "a:0"}
+
+    run = run_pipeline(runs, "key", stages)
+
+    assert calls == {"a": 1, "b": 2, "c": 1}
+    assert run["status"] == "completed" and run["attempts"] == 2
+    assert run["stages"] == {"a": "a:0", "b": "b:1", "c": "c:2"}
+    assert set(run["stage_seconds"]) == {"a", "b", "c"}
+
+
+def test_completed_run_is_not_run_again(runs):
+    calls = Counter()
+    first = run_pipeline(runs, "key", counting_stages(calls))
+
+    again = run_pipeline(runs, "key", counting_stages(calls))
+
+    assert calls == {"a": 1, "b": 1, "c": 1}
+    assert again["stages"] == first["stages"] and again["status"] == "completed"
+
+
+def test_live_lease_raises_and_expired_lease_is_taken_over(runs):
+    runs.insert_one({
+        "_id": "key",
+        "status": "running",
+        "lease_expires_at": datetime.now() + timedelta(minutes=5),
+        "stages": {"a": "a:0"},
+        "started_stages": {}
+    })
+    calls = Counter()
+
+    with pytest.raises(RunInProgressError):
+        run_pipeline(runs, "key", counting_stages(calls))
+    assert calls == {}
+
+    runs.update_one({"_id": "key"}, {"$set": {"lease_expires_at": datetime.now() - timedelta(seconds=1)}})
+    run = run_pipeline(runs, "key", counting_stages(calls))
+    assert run["status"] == "completed"
+    assert calls == {"b": 1, "c": 1}
+
+
+def test_retries_resume_within_one_call(runs):
+    calls = Counter()
+    run = run_pipeline_with_retries(runs, "key", counting_stages(calls, fail=["c"]), max_attempts=2, base_delay=0)
+
+    assert run["status"] == "completed"
+    assert calls == {"a": 1, "b": 1, "c": 2}
+
+
+def publish_stages(text):
+    return [
+        ("formatted_content", lambda outputs: text),
+        (
+            "publish",
+            lambda outputs: create_linkedin_post_with_image(outputs["formatted_content"], "urn:li:digitalmediaAsset:1"),
+            lambda outputs: find_recent_post_by_text(outputs["formatted_content"]),
+        ),
+    ]
+
+
+def test_interrupted_publish_is_reconciled_without_posting_again(runs, linkedin_api):
+    # LinkedIn creates the post but the response never arrives
+    linkedin_api.lose_responses = 1
+    with pytest.raises(Exception, match="Connection reset"):
+        run_pipeline(runs, "key", publish_stages("Hello LinkedIn"))
+    assert "publish" in runs.find_one({"_id": "key"})["started_stages"]
+
+    run = run_pipeline(runs, "key", publish_stages("Hello LinkedIn"))
+
+    assert linkedin_api.create_calls == 1
+    assert run["stages"]["publish"] == {"id": linkedin_api.posts[0]["id"]}
+
+
+def test_interrupted_publish_that_never_posted_runs_again(runs, linkedin_api):
+    linkedin_api.lose_responses = 1
+    with pytest.raises(Exception):
+        run_pipeline(runs, "key", publish_stages("Hello LinkedIn"))
+    # The create call failed before LinkedIn stored anything
+    linkedin_api.posts.clear()
+
+    run = run_pipeline(runs, "key", publish_stages("Hello LinkedIn"))
+
+    assert linkedin_api.create_calls == 2
+    assert run["stages"]["publish"] == {"id": linkedin_api.posts[0]["id"]}
@@ -0,0 +1,95 @@
+import mongomock
+import pytest
+from helpers.rate_limiter import RateLimiter, RateLimitExceeded, MemoryBucketBackend, MongoBucketBackend, DAY
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def burst_limiter(clock, capacity=5, member_per_minute=10, app_per_minute=20, backend=None):
+    return RateLimiter(
+        backend=backend,
+        limits={"ugcPosts": {"member": (capacity, member_per_minute / 60), "app": (capacity, app_per_minute / 60)}},
+        max_wait=DAY,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+def test_burst_throughput_stays_within_app_quota():
+    clock = FakeClock()
+    capacity, app_per_minute, members, calls = 5, 20, 4, 120
+    limiter = burst_limiter(clock, capacity=capacity, app_per_minute=app_per_minute)
+
+    per_minute = {}
+    for call in range(calls):
+        limiter.acquire("ugcPosts", f"member-{call % members}")
+        minute = int(clock.now // 60)
+        per_minute[minute] = per_minute.get(minute, 0) + 1
+
+    assert sum(per_minute.values()) == calls
+    # The first minute may also spend the initial burst
+    assert per_minute[0] <= app_per_minute + capacity
+    for minute, count in per_minute.items():
+        if minute:
+            assert count <= app_per_minute + 1, (minute, count)
+    # Calls are not held back longer than the quota requires
+    assert clock.now <= (calls - capacity) / app_per_minute * 60 + 1
+
+
+def test_member_quota_holds_for_a_single_token():
+    clock = FakeClock()
+    limiter = burst_limiter(clock, capacity=5, member_per_minute=10, app_per_minute=1000)
+    for _ in range(25):
+        limiter.acquire("ugcPosts", "member-0")
+    # 5 burst calls, then 10 per minute
+    assert clock.now == pytest.approx(20 / 10 * 60, abs=0.01)
+
+
+@pytest.mark.parametrize("make_backend", [
+    MemoryBucketBackend,
+    lambda: MongoBucketBackend(mongomock.MongoClient().db.rate_limits),
+])
+def test_member_token_is_refunded_when_app_bucket_rejects(make_backend):
+    backend = make_backend()
+    clock = FakeClock()
+    limiter = RateLimiter(
+        backend=backend,
+        limits={"ugcPosts": {"member": (2, 1 / 60), "app": (1, 1 / 60)}},
+        block=False,
+        clock=clock,
+    )
+    limiter.acquire("ugcPosts", "member-0")
+    for _ in range(3):
+        with pytest.raises(RateLimitExceeded) as error:
+            limiter.acquire("ugcPosts", "member-0")
+        assert error.value.key == "app:ugcPosts"
+
+    # The member still has the second burst token once the app bucket refills
+    clock.now += 60
+    assert limiter.acquire("ugcPosts", "member-0") == 0
+
+
+def test_blocking_wait_over_timeout_refunds_member_token():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        limits={"ugcPosts": {"member": (1, 1 / 60), "app": (1, 1 / 3600)}},
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    limiter.acquire("ugcPosts", "member-0")
+    clock.now += 60
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("ugcPosts", "member-0", timeout=10)
+    # Only the app bucket is empty, the member token was given back
+    with pytest.raises(RateLimitExceeded) as error:
+        limiter.acquire("ugcPosts", "member-0", block=False)
+    assert error.value.key == "app:ugcPosts"
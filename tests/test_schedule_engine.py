@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+import mongomock
+import pytz
+from helpers.accounts import add_account, update_account, mark_account_run
+from helpers.schedule_engine import ScheduleEngine
+from helpers.schedules import next_fire_time
+
+EVERY_DAY = {"days": list(range(7)), "hour": 9, "minute": 0, "timezone": "UTC"}
+
+
+def test_pop_due_fires_in_order_and_reschedules():
+    engine = ScheduleEngine()
+    start = datetime(2026, 1, 5, 8, 0, tzinfo=pytz.utc)
+    engine.upsert("late", {**EVERY_DAY, "minute": 30}, next_fire_time({**EVERY_DAY, "minute": 30}, start))
+    engine.upsert("early", EVERY_DAY, next_fire_time(EVERY_DAY, start))
+
+    assert engine.peek()[1] == "early"
+    assert engine.pop_due(start + timedelta(minutes=59)) == []
+    due = engine.pop_due(start + timedelta(hours=1, minutes=30))
+    assert [account_id for account_id, _ in due] == ["early", "late"]
+    assert engine.peek()[0] == datetime(2026, 1, 6, 9, 0, tzinfo=pytz.utc)
+
+
+def test_reload_during_publish_does_not_fire_account_again():
+    accounts = mongomock.MongoClient().db.accounts
+    account_id = add_account(accounts, "acme", "token", "urn", schedule=EVERY_DAY)
+    fire = accounts.find_one({"_id": account_id})["next_run_at"].replace(tzinfo=pytz.utc)
+
+    engine = ScheduleEngine()
+    engine.reload(accounts)
+    assert engine.pop_due(fire) == [(account_id, fire)]
+
+    # The publish is still running, next_run_at still holds the fire just popped
+    for minute in range(1, 4):
+        engine.reload(accounts)
+        assert engine.pop_due(fire + timedelta(minutes=minute)) == []
+
+    mark_account_run(accounts, {"_id": account_id, "schedule": EVERY_DAY}, fire)
+    engine.reload(accounts)
+    assert engine.pop_due(fire + timedelta(minutes=5)) == []
+    assert engine.peek() == (fire + timedelta(days=1), account_id)
+
+
+def test_reload_picks_up_schedule_changes_and_deactivation():
+    accounts = mongomock.MongoClient().db.accounts
+    account_id = add_account(accounts, "acme", "token", "urn", schedule=EVERY_DAY)
+    engine = ScheduleEngine()
+    engine.reload(accounts)
+
+    update_account(accounts, account_id, schedule={**EVERY_DAY, "hour": 17})
+    engine.reload(accounts)
+    assert engine.peek()[0].hour == 17
+
+    update_account(accounts, account_id, active=False)
+    engine.reload(accounts)
+    assert engine.peek() is None
+
+
+def test_engine_that_never_pops_follows_fires_recorded_by_others():
+    accounts = mongomock.MongoClient().db.accounts
+    account_id = add_account(accounts, "acme", "token", "urn", schedule=EVERY_DAY)
+    # Written after acme, so it is the latest account at every reload, and fires days later
+    in_three_days = (datetime.now(pytz.utc).weekday() + 3) % 7
+    add_account(accounts, "later", "token", "urn", schedule={**EVERY_DAY, "days": [in_three_days]})
+    fire = accounts.find_one({"_id": account_id})["next_run_at"].replace(tzinfo=pytz.utc)
+
+    # Like the API process: reloads and peeks, while another process publishes
+    engine = ScheduleEngine()
+    engine.reload(accounts)
+    assert engine.peek() == (fire, account_id)
+
+    mark_account_run(accounts, {"_id": account_id, "schedule": EVERY_DAY}, fire)
+    engine.reload(accounts)
+
+    assert engine.peek() == (fire + timedelta(days=1), account_id)
@@ -0,0 +1,61 @@
+import json
+import pytest
+from ai_agents.linkedin_create_post_flow import LinkedInFlow
+from ai_agents.stub_llm import StubLLM
+from helpers import tracing
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "exporter", tracing.JsonLinesExporter(str(path)))
+    return path
+
+
+def read_spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_flow_spans_nest_run_crew_iteration_llm(trace_file):
+    with tracing.trace_run("run-1"):
+        LinkedInFlow(agent_llm=StubLLM(topic="Tracing topic")).kickoff()
+
+    spans = read_spans(trace_file)
+    by_id = {span["span_id"]: span for span in spans}
+    parent_kind = {span["span_id"]: by_id[span["parent_id"]]["kind"] if span["parent_id"] else None for span in spans}
+
+    assert {span["run_id"] for span in spans} == {"run-1"}
+    assert len({span["trace_id"] for span in spans}) == 1
+
+    [run] = [span for span in spans if span["kind"] == "run"]
+    assert run["parent_id"] is None
+
+    crews = [span for span in spans if span["kind"] == "crew"]
+    assert [span["name"] for span in crews] == ["topic creator", "post creator"]
+    assert all(parent_kind[span["span_id"]] == "run" for span in crews)
+    assert all("total_tokens" in span["attributes"] for span in crews)
+
+    iterations = [span for span in spans if span["kind"] == "agent_iteration"]
+    assert len(iterations) == 2
+    assert all(parent_kind[span["span_id"]] == "crew" for span in iterations)
+    assert all(span["attributes"]["final"] for span in iterations)
+
+    llm_calls = [span for span in spans if span["kind"] == "llm"]
+    assert len(llm_calls) == 2
+    for span in llm_calls:
+        assert parent_kind[span["span_id"]] == "agent_iteration"
+        assert span["attributes"]["model"] == "stub"
+        assert span["attributes"]["prompt_tokens"] > 0 and span["attributes"]["completion_tokens"] > 0
+
+
+def test_spans_close_in_order_and_record_errors(trace_file):
+    with pytest.raises(Exception, match="boom"):
+        with tracing.trace_run("run-2"):
+            with tracing.trace_span("stage publish", kind="stage"):
+                raise Exception("boom")
+
+    stage, run = read_spans(trace_file)
+    assert stage["parent_id"] == run["span_id"]
+    assert stage["status"] == run["status"] == "error"
+    assert stage["attributes"]["error"] == "boom"
+    assert run["start"] <= stage["start"] <= stage["end"] <= run["end"]